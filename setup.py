@@ -24,6 +24,16 @@ ext_modules = [
         ],
         language='c++'
     ),
+    Extension(
+        'cpp_oms',
+        ['src/execution/oms.cpp'],
+        include_dirs=[
+            get_pybind_include(),
+            'src/execution',
+        ],
+        define_macros=[('OMS_PYTHON', '1')],
+        language='c++'
+    ),
 ]
 
 def has_flag(compiler, flagname):
@@ -1,7 +1,8 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 from loguru import logger
+from src.common.panel import Panel
 
 class Backtester:
     """
@@ -20,111 +21,57 @@ class Backtester:
         self.trades = []
         self.equity_curve = []
 
-    def run(self, data: pd.DataFrame, signals: pd.DataFrame) -> pd.DataFrame:
+    def run(self, data: Union[pd.DataFrame, Panel], signals: Union[pd.DataFrame, Panel]) -> pd.DataFrame:
         """
         Iterate through timestamps to simulate trade execution.
+        Accepts long frames or panels; both are aligned onto the data panel's axes.
         """
         logger.info("Starting backtest...")
         
-        data = data.reset_index() if 'Date' not in data.columns else data
-        signals = signals.reset_index() if 'Date' not in signals.columns else signals
-        
-        required = ['Date', 'Symbol', 'Target_Position']
-        for col in required:
-            if col not in signals.columns:
-                logger.error(f"Required column missing: {col}")
-                raise KeyError(f"Missing column {col} in signals")
+        if not isinstance(data, Panel):
+            data = data.reset_index() if 'Date' not in data.columns else data
+            data = Panel.from_long(data, fields=['Close'])
+        if not isinstance(signals, Panel):
+            signals = signals.reset_index() if 'Date' not in signals.columns else signals
+            required = ['Date', 'Symbol', 'Target_Position']
+            for col in required:
+                if col not in signals.columns:
+                    logger.error(f"Required column missing: {col}")
+                    raise KeyError(f"Missing column {col} in signals")
+            signals = Panel.from_long(signals, fields=['Target_Position'])
+        elif 'Target_Position' not in signals:
+            logger.error("Required field missing: Target_Position")
+            raise KeyError("Missing field Target_Position in signals")
 
-        df = pd.merge(data, signals[['Date', 'Symbol', 'Target_Position']], on=['Date', 'Symbol'], how='left')
-        df = df.sort_values(['Date', 'Symbol'])
+        signals = signals.reindex(data.dates, data.symbols)
+        close = data['Close']
+        targets = signals['Target_Position']
+        symbols = list(data.symbols)
         
         last_prices = {}
 
-        for timestamp, group in df.groupby('Date', sort=True):
+        for i, timestamp in enumerate(data.dates):
+            listed = np.flatnonzero(data.mask[i])
+            if listed.size == 0:
+                continue
+
             # Update valuations with the latest closing prices
-            for _, row in group.iterrows():
-                last_prices[row['Symbol']] = row['Close']
+            for j in listed:
+                last_prices[symbols[j]] = close[i, j]
             
             pre_trade_equity = self.capital
             for sym, pos in self.positions.items():
                 pre_trade_equity += (pos * last_prices.get(sym, 0.0))
 
             # Normalize weights if they exceed unity
-            total_target_weight = group['Target_Position'].sum()
+            day_targets = targets[i, listed]
+            total_target_weight = np.nansum(day_targets)
             if total_target_weight > 1.0:
                 logger.warning(f"Target weights ({total_target_weight}) exceed capacity on {timestamp}. Downscaling...")
-                group['Target_Position'] = group['Target_Position'] / total_target_weight
+                day_targets = day_targets / total_target_weight
 
-            for index, row in group.iterrows():
-                symbol = row['Symbol']
-                price = row['Close']
-                target_weight = row['Target_Position']
-                
-                # Calculate target shares from total portfolio equity
-                target_qty = (pre_trade_equity * target_weight) / price if abs(target_weight) > 1e-6 else 0.0
-                current_qty = self.positions.get(symbol, 0.0)
-                
-                # Check for stop triggers
-                stop_triggered = False
-                if abs(current_qty) > 1e-6:
-                    entry_price = self.entry_prices.get(symbol, price)
-                    session_high = self.session_highs.get(symbol, price)
-                    
-                    if price > session_high:
-                        self.session_highs[symbol] = price
-                        session_high = price
-                    
-                    # 2% stop-loss from entry
-                    stop_loss_pct = 0.02
-                    if price < entry_price * (1 - stop_loss_pct):
-                        logger.warning(f"Stop-loss hit for {symbol} at {price} (Entry: {entry_price})")
-                        stop_triggered = True
-                        target_qty = 0
-                    
-                    # 5% trailing stop from peak
-                    trailing_stop_pct = 0.05
-                    if price < session_high * (1 - trailing_stop_pct):
-                        logger.warning(f"Trailing stop hit for {symbol} at {price} (High: {session_high})")
-                        stop_triggered = True
-                        target_qty = 0
-
-                # Evaluate if a trade is necessary
-                should_trade = False
-                if stop_triggered:
-                    should_trade = True
-                elif abs(target_weight) > 1e-6 and abs(current_qty) < 1e-6:
-                    should_trade = True
-                elif abs(target_weight) < 1e-6 and abs(current_qty) > 1e-6:
-                    should_trade = True
-                elif (target_weight > 1e-6 and current_qty < -1e-6) or (target_weight < -1e-6 and current_qty > 1e-6):
-                    should_trade = True
-                
-                if should_trade:
-                    # Account for slippage (buy higher, sell lower)
-                    execution_price = price * (1 + self.slippage) if target_qty > current_qty else price * (1 - self.slippage)
-                    
-                    trade_qty = target_qty - current_qty
-                    cost = abs(trade_qty) * execution_price
-                    comm_cost = cost * self.commission
-                    
-                    self.capital -= (trade_qty * execution_price + comm_cost)
-                    self.positions[symbol] = target_qty
-                    
-                    if abs(target_qty) > 1e-6:
-                        self.entry_prices[symbol] = execution_price
-                        self.session_highs[symbol] = execution_price
-                    else:
-                        self.entry_prices.pop(symbol, None)
-                        self.session_highs.pop(symbol, None)
-                    
-                    self.trades.append({
-                        'Date': timestamp,
-                        'Symbol': symbol,
-                        'Qty': trade_qty,
-                        'Price': execution_price,
-                        'Cost': cost,
-                        'Commission': comm_cost
-                    })
+            for j, target_weight in zip(listed, day_targets):
+                self._execute_bar(timestamp, symbols[j], close[i, j], target_weight, pre_trade_equity)
 
             # Calculate end-of-day equity
             post_trade_equity = self.capital
@@ -136,6 +83,76 @@ class Backtester:
         logger.info("Backtest completed.")
         return pd.DataFrame(self.equity_curve)
 
+    def _execute_bar(self, timestamp, symbol: str, price: float, target_weight: float, pre_trade_equity: float):
+        """
+        Apply stops and rebalance a single symbol towards its target weight.
+        """
+        # Calculate target shares from total portfolio equity
+        target_qty = (pre_trade_equity * target_weight) / price if abs(target_weight) > 1e-6 else 0.0
+        current_qty = self.positions.get(symbol, 0.0)
+        
+        # Check for stop triggers
+        stop_triggered = False
+        if abs(current_qty) > 1e-6:
+            entry_price = self.entry_prices.get(symbol, price)
+            session_high = self.session_highs.get(symbol, price)
+            
+            if price > session_high:
+                self.session_highs[symbol] = price
+                session_high = price
+            
+            # 2% stop-loss from entry
+            stop_loss_pct = 0.02
+            if price < entry_price * (1 - stop_loss_pct):
+                logger.warning(f"Stop-loss hit for {symbol} at {price} (Entry: {entry_price})")
+                stop_triggered = True
+                target_qty = 0
+            
+            # 5% trailing stop from peak
+            trailing_stop_pct = 0.05
+            if price < session_high * (1 - trailing_stop_pct):
+                logger.warning(f"Trailing stop hit for {symbol} at {price} (High: {session_high})")
+                stop_triggered = True
+                target_qty = 0
+
+        # Evaluate if a trade is necessary
+        should_trade = False
+        if stop_triggered:
+            should_trade = True
+        elif abs(target_weight) > 1e-6 and abs(current_qty) < 1e-6:
+            should_trade = True
+        elif abs(target_weight) < 1e-6 and abs(current_qty) > 1e-6:
+            should_trade = True
+        elif (target_weight > 1e-6 and current_qty < -1e-6) or (target_weight < -1e-6 and current_qty > 1e-6):
+            should_trade = True
+        
+        if should_trade:
+            # Account for slippage (buy higher, sell lower)
+            execution_price = price * (1 + self.slippage) if target_qty > current_qty else price * (1 - self.slippage)
+            
+            trade_qty = target_qty - current_qty
+            cost = abs(trade_qty) * execution_price
+            comm_cost = cost * self.commission
+            
+            self.capital -= (trade_qty * execution_price + comm_cost)
+            self.positions[symbol] = target_qty
+            
+            if abs(target_qty) > 1e-6:
+                self.entry_prices[symbol] = execution_price
+                self.session_highs[symbol] = execution_price
+            else:
+                self.entry_prices.pop(symbol, None)
+                self.session_highs.pop(symbol, None)
+            
+            self.trades.append({
+                'Date': timestamp,
+                'Symbol': symbol,
+                'Qty': trade_qty,
+                'Price': execution_price,
+                'Cost': cost,
+                'Commission': comm_cost
+            })
+
     def get_metrics(self) -> Dict[str, float]:
         df_equity = pd.DataFrame(self.equity_curve)
         if df_equity.empty:
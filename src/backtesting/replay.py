@@ -0,0 +1,233 @@
+import time
+import queue
+import threading
+import pandas as pd
+import numpy as np
+from collections import deque, defaultdict
+from typing import Dict, Any, List, Optional
+from loguru import logger
+
+from src.processing.features import generate_features
+from src.strategy.base_strategy import BaseStrategy
+from src.risk.risk_manager import RiskManager
+from src.execution.order_proxy import OrderProxy
+
+STAGES = ['queue_wait', 'features', 'strategy', 'risk', 'order', 'service', 'tick_to_order']
+
+class LatencyRecorder:
+    """
+    Collects per-stage latency samples (nanoseconds) and summarizes them.
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def record(self, stage: str, nanos: int):
+        self.samples[stage].append(nanos)
+
+    def summary(self) -> pd.DataFrame:
+        """p50 / p99 / max per stage, in microseconds."""
+        rows = []
+        for stage in STAGES:
+            values = np.asarray(self.samples.get(stage, []), dtype=float) / 1e3
+            if values.size == 0:
+                continue
+            rows.append({
+                'Stage': stage,
+                'Count': values.size,
+                'p50_us': np.percentile(values, 50),
+                'p99_us': np.percentile(values, 99),
+                'Max_us': values.max()
+            })
+        return pd.DataFrame(rows)
+
+    def histogram(self, stage: str, bins: int = 20) -> pd.DataFrame:
+        """
+        Log-spaced latency histogram for one stage, in microseconds.
+        Values below the first edge (e.g. zero) are counted in the first bin.
+        """
+        values = np.asarray(self.samples.get(stage, []), dtype=float) / 1e3
+        if values.size == 0:
+            return pd.DataFrame(columns=['Lower_us', 'Upper_us', 'Count'])
+        positive = values[values > 0]
+        lower = max(positive.min(), 1e-3) if positive.size else 1e-3
+        upper = max(values.max(), lower) * 1.0001
+        edges = np.geomspace(lower, upper, bins + 1)
+        counts, edges = np.histogram(np.clip(values, lower, edges[-1]), bins=edges)
+        return pd.DataFrame({'Lower_us': edges[:-1], 'Upper_us': edges[1:], 'Count': counts})
+
+class ReplayHarness:
+    """
+    Replays stored bars through the live chain as a timed event stream:
+    bar -> features -> strategy -> RiskManager.check_trade -> OrderProxy.send_order.
+
+    A producer thread releases one event per timestamp (the cross-section of bars)
+    on the historical schedule compressed by `speed`. In paced mode at most
+    queue_size events are queued; when all slots are taken the event is dropped
+    and counted as backpressure. A bar misses its deadline if its orders are not
+    out before the next bar is due.
+
+    speed=None replays as fast as possible in lock-step: the next event is
+    released only once the previous one is processed, so queue_wait is just the
+    hand-off and tick_to_order tracks 'service' (the processing time) rather than
+    the harness's own buffer. The producer waiting is by design there and is not
+    counted as backpressure; throughput is Events/sec.
+
+    Each run() starts from a fresh latency recorder, counters and portfolio.
+    Bars with a missing or non-positive Close are skipped and counted.
+    """
+
+    def __init__(self, strategy: BaseStrategy, risk_manager: RiskManager, order_proxy: OrderProxy,
+                 speed: Optional[float] = 1.0, lookback: int = 60, queue_size: int = 16,
+                 initial_capital: float = 100000.0):
+        self.strategy = strategy
+        self.risk_manager = risk_manager
+        self.order_proxy = order_proxy
+        self.speed = speed
+        self.lookback = lookback
+        self.queue_size = queue_size
+        self.initial_capital = initial_capital
+
+        self._reset()
+
+    def _reset(self):
+        self.latency = LatencyRecorder()
+        self.cash = self.initial_capital
+        self.positions = {} # symbol -> quantity
+        self.last_prices = {} # symbol -> last close
+        self.counters = defaultdict(int)
+
+    def run(self, bars: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Replay long-format bars (Date, Symbol, OHLCV) and return latency and flow statistics.
+        """
+        self._reset()
+        bars = bars.reset_index() if 'Date' not in bars.columns else bars
+        bars = bars.sort_values(['Date', 'Symbol'], kind='stable')
+        events = [(ts, group) for ts, group in bars.groupby('Date', sort=True)]
+        if not events:
+            return {}
+
+        timestamps = pd.DatetimeIndex([ts for ts, _ in events])
+        offsets = (timestamps - timestamps[0]).total_seconds().to_numpy()
+        bar_interval = float(np.median(np.diff(offsets))) if len(offsets) > 1 else 0.0
+        deadline = bar_interval / self.speed if self.speed else None
+
+        logger.info(f"Replaying {len(events)} bars at {'max' if not self.speed else f'{self.speed}x'} speed...")
+        lockstep = not self.speed
+        channel = queue.Queue()
+        slots = threading.BoundedSemaphore(1 if lockstep else self.queue_size)
+        stop = threading.Event()
+        start = time.perf_counter_ns()
+
+        producer = threading.Thread(target=self._produce, args=(events, offsets, channel, slots, stop, start), daemon=True)
+        producer.start()
+
+        history = deque(maxlen=self.lookback)
+        try:
+            while True:
+                item = channel.get()
+                if item is None:
+                    break
+                if not lockstep:
+                    slots.release()
+                timestamp, group, due_ns = item
+                dequeued = time.perf_counter_ns()
+                self.latency.record('queue_wait', dequeued - due_ns)
+
+                history.append(group)
+                self._on_bar(timestamp, group, history)
+
+                done = time.perf_counter_ns()
+                self.latency.record('service', done - dequeued)
+                self.latency.record('tick_to_order', done - due_ns)
+                self.counters['processed'] += 1
+                if deadline is not None and (done - due_ns) / 1e9 > deadline:
+                    self.counters['deadline_misses'] += 1
+                if lockstep:
+                    slots.release()
+        finally:
+            # Also stops the producer if processing a bar raised
+            stop.set()
+            producer.join()
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+        logger.info("Replay completed.")
+
+        return {
+            'Events': len(events),
+            'Processed': self.counters['processed'],
+            'Dropped': self.counters['dropped'],
+            'Backpressure': self.counters['backpressure'],
+            'Deadline Misses': self.counters['deadline_misses'],
+            'Invalid Prices': self.counters['invalid_prices'],
+            'Orders Sent': self.counters['orders'],
+            'Risk Rejections': self.counters['rejected'],
+            'Elapsed (s)': elapsed,
+            'Events/sec': self.counters['processed'] / elapsed if elapsed > 0 else 0.0,
+            'Latency': self.latency.summary()
+        }
+
+    def _produce(self, events: List, offsets: np.ndarray, channel: queue.Queue,
+                 slots: threading.BoundedSemaphore, stop: threading.Event, start: int):
+        for (timestamp, group), offset in zip(events, offsets):
+            if self.speed:
+                due = start + int(offset / self.speed * 1e9)
+                wait = (due - time.perf_counter_ns()) / 1e9
+                if wait > 0 and stop.wait(wait):
+                    return
+                if not slots.acquire(blocking=False):
+                    # A paced feed does not wait for a slow consumer
+                    self.counters['backpressure'] += 1
+                    self.counters['dropped'] += 1
+                    continue
+            else:
+                # Lock-step: wait for the previous event to be processed
+                while not slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                due = time.perf_counter_ns()
+            if stop.is_set():
+                return
+            channel.put((timestamp, group, due))
+        channel.put(None)
+
+    def _on_bar(self, timestamp, group: pd.DataFrame, history: deque):
+        for symbol, price in zip(group['Symbol'], group['Close']):
+            if price > 0:
+                self.last_prices[symbol] = price
+
+        t0 = time.perf_counter_ns()
+        features = generate_features(pd.concat(history, ignore_index=True))
+        t1 = time.perf_counter_ns()
+        signals = self.strategy.generate_signals(features)
+        latest = signals[signals['Date'] == timestamp]
+        t2 = time.perf_counter_ns()
+        self.latency.record('features', t1 - t0)
+        self.latency.record('strategy', t2 - t1)
+
+        equity = self.cash + sum(q * self.last_prices.get(s, 0.0) for s, q in self.positions.items())
+        for symbol, target_weight, price in zip(latest['Symbol'], latest['Target_Position'], latest['Close']):
+            if not price > 0: # NaN or non-positive close: cannot size the order
+                self.counters['invalid_prices'] += 1
+                continue
+            target_weight = 0.0 if pd.isna(target_weight) else target_weight
+            qty = int((equity * target_weight) / price - self.positions.get(symbol, 0.0))
+            if qty == 0:
+                continue
+
+            r0 = time.perf_counter_ns()
+            approved = self.risk_manager.check_trade(symbol, qty, price, equity, self.positions, self.last_prices)
+            r1 = time.perf_counter_ns()
+            self.latency.record('risk', r1 - r0)
+            if not approved:
+                self.counters['rejected'] += 1
+                continue
+
+            side = 'BUY' if qty > 0 else 'SELL'
+            self.order_proxy.send_order(symbol, side, abs(qty), price)
+            self.latency.record('order', time.perf_counter_ns() - r1)
+            self.counters['orders'] += 1
+
+            # Assume the order fills at the bar close
+            self.positions[symbol] = self.positions.get(symbol, 0.0) + qty
+            self.cash -= qty * price
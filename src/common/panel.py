@@ -0,0 +1,124 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+class Panel:
+    """
+    Wide (dates x symbols) market data container.
+    Holds one aligned 2-D float array per field plus a boolean listing mask,
+    so per-symbol series are columns and per-date cross-sections are rows.
+    """
+
+    def __init__(self, dates: pd.Index, symbols: pd.Index, fields: Optional[Dict[str, np.ndarray]] = None, mask: Optional[np.ndarray] = None):
+        self.dates = pd.Index(dates, name='Date')
+        self.symbols = pd.Index(symbols, name='Symbol')
+        self.shape = (len(self.dates), len(self.symbols))
+        self.mask = np.ones(self.shape, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        if self.mask.shape != self.shape:
+            raise ValueError(f"Mask shape {self.mask.shape} does not match panel shape {self.shape}")
+        self.fields = {}
+        for name, values in (fields or {}).items():
+            self[name] = values
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame, fields: Optional[Iterable[str]] = None) -> "Panel":
+        """
+        Pivot a long (Date, Symbol, field...) frame into a panel.
+        Only numeric columns are carried over unless `fields` is given.
+        """
+        df = df.reset_index() if 'Date' not in df.columns else df
+        for col in ['Date', 'Symbol']:
+            if col not in df.columns:
+                raise KeyError(f"Missing column {col} in long frame")
+
+        dates = pd.Index(df['Date'].unique()).sort_values()
+        symbols = pd.Index(df['Symbol'].unique()).sort_values()
+        row = dates.get_indexer(df['Date'])
+        col = symbols.get_indexer(df['Symbol'])
+
+        mask = np.zeros((len(dates), len(symbols)), dtype=bool)
+        mask[row, col] = True
+        if mask.sum() != len(df):
+            raise ValueError("Duplicate (Date, Symbol) rows in long frame")
+
+        if fields is None:
+            fields = [c for c in df.columns if c not in ('Date', 'Symbol') and pd.api.types.is_numeric_dtype(df[c])]
+
+        panel = cls(dates, symbols, mask=mask)
+        for name in fields:
+            values = np.full(panel.shape, np.nan)
+            values[row, col] = df[name].to_numpy(dtype=float, na_value=np.nan)
+            panel.fields[name] = values
+        return panel
+
+    def to_long(self) -> pd.DataFrame:
+        """
+        Flatten back to a long frame sorted by [Date, Symbol], one row per listed cell.
+        """
+        row, col = np.nonzero(self.mask)
+        out = {'Date': self.dates.take(row), 'Symbol': self.symbols.take(col)}
+        for name, values in self.fields.items():
+            out[name] = values[row, col]
+        return pd.DataFrame(out)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.fields[name]
+
+    def __setitem__(self, name: str, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        if values.shape != self.shape:
+            raise ValueError(f"Field {name} has shape {values.shape}, expected {self.shape}")
+        self.fields[name] = values
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.fields
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.fields)
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """Wide DataFrame view of a single field (dates as index, symbols as columns)."""
+        return pd.DataFrame(self.fields[name], index=self.dates, columns=self.symbols, copy=False)
+
+    def masked(self, values):
+        """Blank out cells for symbols that are not listed on a given date."""
+        if isinstance(values, pd.DataFrame):
+            return values.where(self.mask)
+        return np.where(self.mask, values, np.nan)
+
+    def compact(self, values):
+        """
+        Shift each symbol's listed cells to the top of its column, keeping date order
+        and NaN-padding below. Diffs and rolling windows over the result see only
+        listed rows, exactly like the symbol's long-format series.
+        """
+        order = np.argsort(~self.mask, axis=0, kind='stable')
+        return np.take_along_axis(self.masked(np.asarray(values, dtype=float)), order, axis=0)
+
+    def expand(self, values) -> np.ndarray:
+        """Inverse of compact: scatter per-symbol rows back onto the date axis."""
+        order = np.argsort(~self.mask, axis=0, kind='stable')
+        out = np.empty(self.shape)
+        np.put_along_axis(out, order, np.asarray(values, dtype=float), axis=0)
+        return self.masked(out)
+
+    def reindex(self, dates: pd.Index, symbols: pd.Index) -> "Panel":
+        """
+        Conform the panel to new axes. Cells outside the original axes are unlisted.
+        """
+        row = self.dates.get_indexer(dates)
+        col = self.symbols.get_indexer(symbols)
+        valid = (row[:, None] >= 0) & (col[None, :] >= 0)
+
+        mask = valid & self.mask[row][:, col]
+        panel = Panel(dates, symbols, mask=mask)
+        for name, values in self.fields.items():
+            panel.fields[name] = np.where(valid, values[row][:, col], np.nan)
+        return panel
+
+    def copy(self) -> "Panel":
+        return Panel(self.dates, self.symbols, {k: v.copy() for k, v in self.fields.items()}, self.mask.copy())
+
+    def __repr__(self) -> str:
+        return f"Panel(dates={self.shape[0]}, symbols={self.shape[1]}, fields={self.columns})"
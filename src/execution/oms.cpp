@@ -1,13 +1,31 @@
+#include <algorithm>
 #include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
 #include <iostream>
-#include <map>
 #include <mutex>
 #include <queue>
+#include <random>
+#include <stdexcept>
 #include <string>
+#include <unordered_map>
 #include <vector>
 
-enum class OrderStatus { NEW, PENDING, FILLED, CANCELLED, REJECTED };
+#ifdef OMS_PYTHON
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+namespace py = pybind11;
+#endif
+
+enum class OrderStatus { NEW, PENDING, PARTIALLY_FILLED, FILLED, CANCELLED, REJECTED };
 enum class Side { BUY, SELL };
+enum class OrderType { LIMIT, MARKET };
+enum class ExecType { NEW, PARTIAL_FILL, FILL, CANCELLED, REJECTED };
+
+using OrderId = uint64_t;
+constexpr uint32_t NIL = UINT32_MAX;
+constexpr uint32_t NO_SYMBOL = UINT32_MAX; // report symbol for ids the engine never issued
 
 struct Order {
   std::string order_id;
@@ -17,15 +35,451 @@ struct Order {
   int quantity;
   OrderStatus status;
   std::chrono::system_clock::time_point timestamp;
+  OrderType type = OrderType::LIMIT;
+};
+
+struct ExecutionReport {
+  OrderId order_id;
+  OrderId contra_id; // resting order on the other side of a fill, 0 otherwise
+  uint32_t symbol; // NO_SYMBOL when rejecting an unknown order id
+  Side side;
+  ExecType exec_type;
+  double price;
+  int32_t last_qty;
+  int32_t leaves_qty;
+  uint64_t seq;
+};
+
+/*
+ * Resting order slot. Orders at a price level form an intrusive doubly-linked
+ * FIFO through prev/next slot indices, so priority is kept without allocation.
+ */
+struct OrderNode {
+  OrderId id;
+  int64_t price;
+  int32_t leaves;
+  uint32_t symbol;
+  uint32_t prev;
+  uint32_t next;
+  Side side;
+};
+
+struct Level {
+  uint32_t head = NIL;
+  uint32_t tail = NIL;
+  int64_t qty = 0;
+};
+
+/*
+ * One side of a book: a flat array of levels indexed by (tick - base).
+ * The window re-anchors when the side is empty and otherwise grows or slides
+ * to cover resting orders, but never beyond max_levels ticks; orders that
+ * would need a wider window are refused by reserve().
+ */
+class BookSide {
+public:
+  BookSide(bool is_bid, int64_t max_levels)
+      : is_bid_(is_bid), max_levels_(max_levels) {}
+
+  // Read-only lookup; never grows the array
+  const Level *find(int64_t tick) const {
+    int64_t i = tick - base_;
+    if (i < 0 || i >= static_cast<int64_t>(levels_.size()))
+      return nullptr;
+    return &levels_[i];
+  }
+
+  // Level for a tick known to be inside the window (resting or reserved)
+  Level &at(int64_t tick) { return levels_[tick - base_]; }
+
+  bool empty() const { return !has_best_; }
+  int64_t best() const { return best_; }
+
+  bool crosses(int64_t limit) const {
+    return has_best_ && (is_bid_ ? best_ >= limit : best_ <= limit);
+  }
+
+  void on_add(int64_t tick) {
+    ++resting_;
+    if (!has_best_ || (is_bid_ ? tick > best_ : tick < best_)) {
+      best_ = tick;
+      has_best_ = true;
+    }
+  }
+
+  // Called when an order leaves the level at `tick`; moves best past drained levels
+  void on_remove(int64_t tick) {
+    --resting_;
+    if (tick != best_ || levels_[tick - base_].head != NIL)
+      return;
+    int64_t step = is_bid_ ? -1 : 1;
+    int64_t lo = base_, hi = base_ + static_cast<int64_t>(levels_.size());
+    for (int64_t t = tick + step; t >= lo && t < hi; t += step) {
+      if (levels_[t - base_].head != NIL) {
+        best_ = t;
+        return;
+      }
+    }
+    has_best_ = false;
+  }
+
+  // Make `tick` addressable; false if that would need more than max_levels ticks
+  bool reserve(int64_t tick) {
+    int64_t size = static_cast<int64_t>(levels_.size());
+    if (size == 0 || resting_ == 0) {
+      if (size == 0) {
+        size = std::min<int64_t>(1024, max_levels_);
+        levels_.resize(static_cast<size_t>(size));
+      }
+      base_ = tick - size / 2;
+      return true;
+    }
+    if (tick >= base_ && tick < base_ + size)
+      return true;
+
+    // Occupied span; levels outside it are empty and can be dropped
+    int64_t lo = 0, hi = size - 1;
+    while (levels_[lo].head == NIL)
+      ++lo;
+    while (levels_[hi].head == NIL)
+      --hi;
+    int64_t new_lo = std::min(base_ + lo, tick);
+    int64_t new_hi = std::max(base_ + hi, tick);
+    int64_t span = new_hi - new_lo + 1;
+    if (span > max_levels_)
+      return false;
+
+    int64_t new_size = std::min(max_levels_, std::max(size, 2 * span));
+    int64_t new_base = new_lo - (new_size - span) / 2;
+    std::vector<Level> moved(static_cast<size_t>(new_size));
+    std::copy(levels_.begin() + lo, levels_.begin() + hi + 1,
+              moved.begin() + (base_ + lo - new_base));
+    levels_.swap(moved);
+    base_ = new_base;
+    return true;
+  }
+
+private:
+  bool is_bid_;
+  int64_t max_levels_;
+  std::vector<Level> levels_;
+  int64_t base_ = 0;
+  int64_t best_ = 0;
+  bool has_best_ = false;
+  int64_t resting_ = 0;
+};
+
+struct OrderBook {
+  explicit OrderBook(int64_t max_levels)
+      : bids(true, max_levels), asks(false, max_levels) {}
+  BookSide bids;
+  BookSide asks;
 };
 
+/*
+ * Price-time priority matching engine over many symbols.
+ * Prices are integer ticks internally; order state lives in a flat slot pool
+ * with a free list, and order ids are dense so lookups are array indexing.
+ * Each book side spans at most max_levels ticks around its resting orders.
+ */
+class MatchingEngine {
+public:
+  explicit MatchingEngine(double tick_size = 0.01, int64_t max_levels = 1 << 16)
+      : tick_size_(tick_size), max_levels_(max_levels) {
+    if (!(tick_size > 0) || max_levels <= 0)
+      throw std::invalid_argument("tick_size and max_levels must be positive");
+    // Id 0 is reserved for "no order"
+    id_to_slot_.push_back(NIL);
+    status_.push_back(OrderStatus::REJECTED);
+    order_symbol_.push_back(NO_SYMBOL);
+    order_side_.push_back(Side::BUY);
+  }
+
+  uint32_t symbol_id(const std::string &symbol) {
+    auto it = symbol_ids_.find(symbol);
+    if (it != symbol_ids_.end())
+      return it->second;
+    uint32_t id = static_cast<uint32_t>(books_.size());
+    symbol_ids_.emplace(symbol, id);
+    symbols_.push_back(symbol);
+    books_.emplace_back(max_levels_);
+    return id;
+  }
+
+  // Id of an already registered symbol, NO_SYMBOL otherwise
+  uint32_t find_symbol(const std::string &symbol) const {
+    auto it = symbol_ids_.find(symbol);
+    return it != symbol_ids_.end() ? it->second : NO_SYMBOL;
+  }
+
+  const std::string &symbol_name(uint32_t id) const {
+    check_symbol(id);
+    return symbols_[id];
+  }
+
+  int64_t to_ticks(double price) const {
+    return static_cast<int64_t>(std::llround(price / tick_size_));
+  }
+  double to_price(int64_t ticks) const { return ticks * tick_size_; }
+  double tick_size() const { return tick_size_; }
+
+  // Limit order at a decimal price; NaN, non-positive or out-of-range prices are rejected
+  OrderId submit_limit_price(uint32_t symbol, Side side, double price, int32_t qty) {
+    double ticks = price / tick_size_;
+    if (!std::isfinite(ticks) || ticks < 0.5 || ticks > 1e15) {
+      OrderId id = next_id(symbol, side);
+      reject(id, symbol, side, 0, qty);
+      return id;
+    }
+    return submit_limit(symbol, side, to_ticks(price), qty);
+  }
+
+  OrderId submit_limit(uint32_t symbol, Side side, int64_t price, int32_t qty) {
+    OrderId id = next_id(symbol, side);
+    if (symbol >= books_.size() || qty <= 0 || price <= 0) {
+      reject(id, symbol, side, price, qty);
+      return id;
+    }
+    report(id, 0, symbol, side, ExecType::NEW, price, 0, qty);
+    int32_t leaves = match(id, symbol, side, price, qty, false);
+    if (leaves > 0 && !rest(id, symbol, side, price, leaves)) {
+      // Too far from the resting book to fit the level window: reject outright,
+      // or cancel the remainder of a partly filled order
+      if (leaves < qty) {
+        status_[id] = OrderStatus::CANCELLED;
+        report(id, 0, symbol, side, ExecType::CANCELLED, price, 0, 0);
+      } else {
+        reject(id, symbol, side, price, leaves);
+      }
+    }
+    return id;
+  }
+
+  OrderId submit_market(uint32_t symbol, Side side, int32_t qty) {
+    OrderId id = next_id(symbol, side);
+    if (symbol >= books_.size() || qty <= 0) {
+      reject(id, symbol, side, 0, qty);
+      return id;
+    }
+    report(id, 0, symbol, side, ExecType::NEW, 0, 0, qty);
+    int32_t leaves = match(id, symbol, side, 0, qty, true);
+    if (leaves > 0) {
+      // Unfilled market remainder is cancelled rather than rested
+      status_[id] = OrderStatus::CANCELLED;
+      report(id, 0, symbol, side, ExecType::CANCELLED, 0, 0, 0);
+    }
+    return id;
+  }
+
+  bool cancel(OrderId id) {
+    bool known = id > 0 && id < id_to_slot_.size();
+    uint32_t slot = known ? id_to_slot_[id] : NIL;
+    if (slot == NIL) {
+      // Cancel reject: unknown ids carry NO_SYMBOL, closed ones their own symbol
+      report(id, 0, known ? order_symbol_[id] : NO_SYMBOL,
+             known ? order_side_[id] : Side::BUY, ExecType::REJECTED, 0, 0, 0);
+      return false;
+    }
+    OrderNode &node = pool_[slot];
+    BookSide &book_side = side_of(node.symbol, node.side);
+    unlink(book_side.at(node.price), slot);
+    book_side.on_remove(node.price);
+    status_[id] = OrderStatus::CANCELLED;
+    report(id, 0, node.symbol, node.side, ExecType::CANCELLED, node.price, 0, 0);
+    release(slot);
+    return true;
+  }
+
+  OrderStatus status(OrderId id) const {
+    return id < status_.size() ? status_[id] : OrderStatus::REJECTED;
+  }
+
+  int32_t leaves_qty(OrderId id) const {
+    uint32_t slot = id < id_to_slot_.size() ? id_to_slot_[id] : NIL;
+    return slot == NIL ? 0 : pool_[slot].leaves;
+  }
+
+  bool has_bid(uint32_t symbol) const {
+    check_symbol(symbol);
+    return !books_[symbol].bids.empty();
+  }
+  bool has_ask(uint32_t symbol) const {
+    check_symbol(symbol);
+    return !books_[symbol].asks.empty();
+  }
+  int64_t best_bid(uint32_t symbol) const {
+    check_symbol(symbol);
+    return books_[symbol].bids.best();
+  }
+  int64_t best_ask(uint32_t symbol) const {
+    check_symbol(symbol);
+    return books_[symbol].asks.best();
+  }
+
+  int64_t depth(uint32_t symbol, Side side, int64_t price) const {
+    check_symbol(symbol);
+    const OrderBook &book = books_[symbol];
+    const Level *lvl = (side == Side::BUY ? book.bids : book.asks).find(price);
+    return lvl ? lvl->qty : 0;
+  }
+
+  std::vector<ExecutionReport> &reports() { return reports_; }
+
+  std::vector<ExecutionReport> drain_reports() {
+    std::vector<ExecutionReport> out;
+    out.swap(reports_);
+    return out;
+  }
+
+private:
+  void check_symbol(uint32_t symbol) const {
+    if (symbol >= books_.size())
+      throw std::out_of_range("unknown symbol id " + std::to_string(symbol));
+  }
+
+  OrderId next_id(uint32_t symbol, Side side) {
+    OrderId id = id_to_slot_.size();
+    id_to_slot_.push_back(NIL);
+    status_.push_back(OrderStatus::NEW);
+    order_symbol_.push_back(symbol < books_.size() ? symbol : NO_SYMBOL);
+    order_side_.push_back(side);
+    return id;
+  }
+
+  BookSide &side_of(uint32_t symbol, Side side) {
+    return side == Side::BUY ? books_[symbol].bids : books_[symbol].asks;
+  }
+
+  int32_t match(OrderId id, uint32_t symbol, Side side, int64_t limit,
+                int32_t qty, bool market) {
+    BookSide &contra = side == Side::BUY ? books_[symbol].asks : books_[symbol].bids;
+    Side contra_side = side == Side::BUY ? Side::SELL : Side::BUY;
+
+    while (qty > 0 && !contra.empty() && (market || contra.crosses(limit))) {
+      int64_t px = contra.best();
+      Level &lvl = contra.at(px);
+      while (qty > 0 && lvl.head != NIL) {
+        uint32_t slot = lvl.head;
+        OrderNode &maker = pool_[slot];
+        int32_t fill = std::min(qty, maker.leaves);
+        qty -= fill;
+        maker.leaves -= fill;
+        lvl.qty -= fill;
+
+        OrderId maker_id = maker.id;
+        if (maker.leaves == 0) {
+          status_[maker_id] = OrderStatus::FILLED;
+          report(maker_id, id, symbol, contra_side, ExecType::FILL, px, fill, 0);
+          unlink(lvl, slot);
+          release(slot);
+          contra.on_remove(px);
+        } else {
+          status_[maker_id] = OrderStatus::PARTIALLY_FILLED;
+          report(maker_id, id, symbol, contra_side, ExecType::PARTIAL_FILL, px,
+                 fill, maker.leaves);
+        }
+        status_[id] = qty == 0 ? OrderStatus::FILLED : OrderStatus::PARTIALLY_FILLED;
+        report(id, maker_id, symbol, side,
+               qty == 0 ? ExecType::FILL : ExecType::PARTIAL_FILL, px, fill, qty);
+      }
+    }
+    return qty;
+  }
+
+  bool rest(OrderId id, uint32_t symbol, Side side, int64_t price, int32_t qty) {
+    BookSide &book_side = side_of(symbol, side);
+    if (!book_side.reserve(price))
+      return false;
+
+    uint32_t slot = acquire();
+    OrderNode &node = pool_[slot];
+    node.id = id;
+    node.price = price;
+    node.leaves = qty;
+    node.symbol = symbol;
+    node.side = side;
+    node.next = NIL;
+
+    Level &lvl = book_side.at(price);
+    node.prev = lvl.tail;
+    if (lvl.tail != NIL)
+      pool_[lvl.tail].next = slot;
+    else
+      lvl.head = slot;
+    lvl.tail = slot;
+    lvl.qty += qty;
+    book_side.on_add(price);
+    id_to_slot_[id] = slot;
+    return true;
+  }
+
+  void unlink(Level &lvl, uint32_t slot) {
+    OrderNode &node = pool_[slot];
+    if (node.prev != NIL)
+      pool_[node.prev].next = node.next;
+    else
+      lvl.head = node.next;
+    if (node.next != NIL)
+      pool_[node.next].prev = node.prev;
+    else
+      lvl.tail = node.prev;
+    lvl.qty -= node.leaves;
+  }
+
+  uint32_t acquire() {
+    if (!free_.empty()) {
+      uint32_t slot = free_.back();
+      free_.pop_back();
+      return slot;
+    }
+    pool_.emplace_back();
+    return static_cast<uint32_t>(pool_.size() - 1);
+  }
+
+  void release(uint32_t slot) {
+    id_to_slot_[pool_[slot].id] = NIL;
+    free_.push_back(slot);
+  }
+
+  void reject(OrderId id, uint32_t symbol, Side side, int64_t price, int32_t qty) {
+    status_[id] = OrderStatus::REJECTED;
+    report(id, 0, symbol, side, ExecType::REJECTED, price, 0, qty);
+  }
+
+  void report(OrderId id, OrderId contra, uint32_t symbol, Side side,
+              ExecType type, int64_t price, int32_t last_qty, int32_t leaves) {
+    reports_.push_back({id, contra, symbol, side, type, to_price(price),
+                        last_qty, leaves, ++seq_});
+  }
+
+  double tick_size_;
+  int64_t max_levels_;
+  std::vector<OrderBook> books_;
+  std::vector<std::string> symbols_;
+  std::unordered_map<std::string, uint32_t> symbol_ids_;
+  std::vector<OrderNode> pool_;
+  std::vector<uint32_t> free_;
+  std::vector<uint32_t> id_to_slot_;
+  std::vector<OrderStatus> status_;
+  std::vector<uint32_t> order_symbol_;
+  std::vector<Side> order_side_;
+  std::vector<ExecutionReport> reports_;
+  uint64_t seq_ = 0;
+};
+
+/*
+ * String-keyed front end kept for the Python proxy: orders queue on submit
+ * and are routed into the matching engine by process_orders().
+ */
 class OMS {
 public:
+  explicit OMS(double tick_size = 0.01) : engine_(tick_size) {}
+
   void submit_order(const Order &order) {
     std::lock_guard<std::mutex> lock(mtx_);
-    orders_[order.order_id] = order;
-    orders_[order.order_id].status = OrderStatus::PENDING;
-    pending_queue_.push(order.order_id);
+    Order pending = order;
+    pending.status = OrderStatus::PENDING;
+    pending_queue_.push(pending);
     std::cout << "[OMS] Order submitted: " << order.order_id << " for "
               << order.symbol << std::endl;
   }
@@ -33,42 +487,277 @@ public:
   void process_orders() {
     std::lock_guard<std::mutex> lock(mtx_);
     while (!pending_queue_.empty()) {
-      std::string id = pending_queue_.front();
+      Order order = pending_queue_.front();
       pending_queue_.pop();
 
-      // Auto-fill order for simulation
-      orders_[id].status = OrderStatus::FILLED;
-      std::cout << "[OMS] Order filled: " << id << std::endl;
+      uint32_t sym = engine_.symbol_id(order.symbol);
+      OrderId id = order.type == OrderType::MARKET
+                       ? engine_.submit_market(sym, order.side, order.quantity)
+                       : engine_.submit_limit_price(sym, order.side, order.price,
+                                                    order.quantity);
+      ids_[order.order_id] = id;
+      client_ids_.resize(id + 1);
+      client_ids_[id] = order.order_id;
     }
   }
 
+  bool cancel_order(const std::string &id) {
+    std::lock_guard<std::mutex> lock(mtx_);
+    auto it = ids_.find(id);
+    return it != ids_.end() && engine_.cancel(it->second);
+  }
+
   OrderStatus get_status(const std::string &id) {
     std::lock_guard<std::mutex> lock(mtx_);
-    if (orders_.count(id))
-      return orders_[id].status;
+    auto it = ids_.find(id);
+    if (it != ids_.end())
+      return engine_.status(it->second);
     return OrderStatus::REJECTED;
   }
 
+  const std::string &client_id(OrderId id) const { return client_ids_[id]; }
+
+  std::vector<ExecutionReport> drain_reports() {
+    std::lock_guard<std::mutex> lock(mtx_);
+    return engine_.drain_reports();
+  }
+
 private:
-  std::map<std::string, Order> orders_;
-  std::queue<std::string> pending_queue_;
+  MatchingEngine engine_;
+  std::unordered_map<std::string, OrderId> ids_;
+  std::vector<std::string> client_ids_;
+  std::queue<Order> pending_queue_;
   std::mutex mtx_;
 };
 
+enum class EventType : uint8_t { LIMIT, MARKET, CANCEL };
+
+struct ReplayEvent {
+  EventType type;
+  Side side;
+  uint32_t symbol;
+  int64_t price;
+  int32_t qty;
+  uint64_t ref; // order to cancel, as an index into submitted orders
+};
+
+/*
+ * Synthetic order flow around a random-walk mid: ~60% limits, ~30% cancels,
+ * ~10% marketable orders. Generated up front so only matching is timed.
+ */
+std::vector<ReplayEvent> make_replay_events(size_t n_events, uint32_t n_symbols,
+                                            uint64_t seed) {
+  std::mt19937_64 rng(seed);
+  std::uniform_real_distribution<double> unit(0.0, 1.0);
+  std::vector<int64_t> mid(n_symbols, 10000);
+  std::vector<ReplayEvent> events;
+  events.reserve(n_events);
+  uint64_t submitted = 0;
+
+  for (size_t i = 0; i < n_events; ++i) {
+    uint32_t sym = static_cast<uint32_t>(rng() % n_symbols);
+    Side side = (rng() & 1) ? Side::BUY : Side::SELL;
+    double u = unit(rng);
+    if (u < 0.3 && submitted > 0) {
+      uint64_t back = std::min<uint64_t>(submitted, 1000);
+      events.push_back({EventType::CANCEL, side, sym, 0, 0,
+                        submitted - 1 - rng() % back});
+      continue;
+    }
+    int32_t qty = 1 + static_cast<int32_t>(rng() % 100);
+    if (u < 0.4) {
+      events.push_back({EventType::MARKET, side, sym, 0, qty, 0});
+    } else {
+      mid[sym] += static_cast<int64_t>(rng() % 3) - 1;
+      int64_t offset = 1 + static_cast<int64_t>(rng() % 20);
+      int64_t px = side == Side::BUY ? mid[sym] - offset : mid[sym] + offset;
+      events.push_back({EventType::LIMIT, side, sym, px, qty, 0});
+    }
+    ++submitted;
+  }
+  return events;
+}
+
+struct ReplayResult {
+  size_t events;
+  double seconds;
+  double events_per_sec;
+  uint64_t fills;
+};
+
+ReplayResult replay_benchmark(size_t n_events, uint32_t n_symbols,
+                              uint64_t seed) {
+  std::vector<ReplayEvent> events = make_replay_events(n_events, n_symbols, seed);
+  MatchingEngine engine;
+  for (uint32_t s = 0; s < n_symbols; ++s)
+    engine.symbol_id("SYM" + std::to_string(s));
+  engine.reports().reserve(1 << 14);
+
+  std::vector<OrderId> ids;
+  ids.reserve(n_events);
+  uint64_t fills = 0;
+
+  auto start = std::chrono::steady_clock::now();
+  for (const ReplayEvent &ev : events) {
+    // Stand-in for a consumer draining execution reports
+    if (engine.reports().size() > 4096)
+      engine.reports().clear();
+    switch (ev.type) {
+    case EventType::LIMIT:
+      ids.push_back(engine.submit_limit(ev.symbol, ev.side, ev.price, ev.qty));
+      break;
+    case EventType::MARKET:
+      ids.push_back(engine.submit_market(ev.symbol, ev.side, ev.qty));
+      break;
+    case EventType::CANCEL:
+      engine.cancel(ids[ev.ref]);
+      break;
+    }
+  }
+  auto end = std::chrono::steady_clock::now();
+
+  for (OrderId id : ids)
+    fills += engine.status(id) == OrderStatus::FILLED;
+  double secs = std::chrono::duration<double>(end - start).count();
+  return {events.size(), secs, events.size() / secs, fills};
+}
+
+#ifdef OMS_PYTHON
+PYBIND11_MODULE(cpp_oms, m) {
+  m.doc() = "Price-time priority order matching engine implemented in C++";
+  m.attr("NO_SYMBOL") = NO_SYMBOL;
+
+  py::enum_<OrderStatus>(m, "OrderStatus")
+      .value("NEW", OrderStatus::NEW)
+      .value("PENDING", OrderStatus::PENDING)
+      .value("PARTIALLY_FILLED", OrderStatus::PARTIALLY_FILLED)
+      .value("FILLED", OrderStatus::FILLED)
+      .value("CANCELLED", OrderStatus::CANCELLED)
+      .value("REJECTED", OrderStatus::REJECTED);
+  py::enum_<Side>(m, "Side").value("BUY", Side::BUY).value("SELL", Side::SELL);
+  py::enum_<OrderType>(m, "OrderType")
+      .value("LIMIT", OrderType::LIMIT)
+      .value("MARKET", OrderType::MARKET);
+  py::enum_<ExecType>(m, "ExecType")
+      .value("NEW", ExecType::NEW)
+      .value("PARTIAL_FILL", ExecType::PARTIAL_FILL)
+      .value("FILL", ExecType::FILL)
+      .value("CANCELLED", ExecType::CANCELLED)
+      .value("REJECTED", ExecType::REJECTED);
+
+  py::class_<ExecutionReport>(m, "ExecutionReport")
+      .def_readonly("order_id", &ExecutionReport::order_id)
+      .def_readonly("contra_id", &ExecutionReport::contra_id)
+      .def_readonly("symbol", &ExecutionReport::symbol)
+      .def_readonly("side", &ExecutionReport::side)
+      .def_readonly("exec_type", &ExecutionReport::exec_type)
+      .def_readonly("price", &ExecutionReport::price)
+      .def_readonly("last_qty", &ExecutionReport::last_qty)
+      .def_readonly("leaves_qty", &ExecutionReport::leaves_qty)
+      .def_readonly("seq", &ExecutionReport::seq);
+
+  py::class_<MatchingEngine>(m, "MatchingEngine")
+      .def(py::init<double, int64_t>(), py::arg("tick_size") = 0.01,
+           py::arg("max_levels") = 1 << 16)
+      .def("symbol_id", &MatchingEngine::symbol_id, py::arg("symbol"))
+      .def("symbol_name", &MatchingEngine::symbol_name, py::arg("symbol_id"))
+      .def(
+          "submit_limit",
+          [](MatchingEngine &e, const std::string &symbol, Side side,
+             double price, int32_t qty) {
+            return e.submit_limit_price(e.symbol_id(symbol), side, price, qty);
+          },
+          py::arg("symbol"), py::arg("side"), py::arg("price"), py::arg("qty"))
+      .def(
+          "submit_market",
+          [](MatchingEngine &e, const std::string &symbol, Side side,
+             int32_t qty) { return e.submit_market(e.symbol_id(symbol), side, qty); },
+          py::arg("symbol"), py::arg("side"), py::arg("qty"))
+      .def("cancel", &MatchingEngine::cancel, py::arg("order_id"))
+      .def("status", &MatchingEngine::status, py::arg("order_id"))
+      .def("leaves_qty", &MatchingEngine::leaves_qty, py::arg("order_id"))
+      .def(
+          "best_bid",
+          [](const MatchingEngine &e, const std::string &symbol) -> py::object {
+            uint32_t s = e.find_symbol(symbol);
+            if (s == NO_SYMBOL || !e.has_bid(s))
+              return py::none();
+            return py::float_(e.to_price(e.best_bid(s)));
+          },
+          py::arg("symbol"))
+      .def(
+          "best_ask",
+          [](const MatchingEngine &e, const std::string &symbol) -> py::object {
+            uint32_t s = e.find_symbol(symbol);
+            if (s == NO_SYMBOL || !e.has_ask(s))
+              return py::none();
+            return py::float_(e.to_price(e.best_ask(s)));
+          },
+          py::arg("symbol"))
+      .def(
+          "depth",
+          [](const MatchingEngine &e, const std::string &symbol, Side side,
+             double price) -> int64_t {
+            uint32_t s = e.find_symbol(symbol);
+            double ticks = price / e.tick_size();
+            if (s == NO_SYMBOL || !std::isfinite(ticks) || std::fabs(ticks) > 1e15)
+              return 0;
+            return e.depth(s, side, e.to_ticks(price));
+          },
+          py::arg("symbol"), py::arg("side"), py::arg("price"))
+      .def("drain_reports", &MatchingEngine::drain_reports);
+
+  py::class_<ReplayResult>(m, "ReplayResult")
+      .def_readonly("events", &ReplayResult::events)
+      .def_readonly("seconds", &ReplayResult::seconds)
+      .def_readonly("events_per_sec", &ReplayResult::events_per_sec)
+      .def_readonly("fills", &ReplayResult::fills);
+
+  m.def("replay_benchmark", &replay_benchmark,
+        "Replay synthetic order flow through a fresh engine on one core",
+        py::arg("n_events") = 5000000, py::arg("n_symbols") = 100,
+        py::arg("seed") = 42);
+}
+#else
 /*
  * Note: This facilitates standalone OMS logic testing.
  * Production implementation requires a dedicated IPC controller.
+ * Run with `--bench [n_events]` for the replay benchmark.
  */
-int main() {
+int main(int argc, char **argv) {
+  if (argc > 1 && std::string(argv[1]) == "--bench") {
+    size_t n = argc > 2 ? std::strtoull(argv[2], nullptr, 10) : 5000000;
+    ReplayResult r = replay_benchmark(n, 100, 42);
+    std::cout << "[OMS] Replayed " << r.events << " events in " << r.seconds
+              << "s (" << r.events_per_sec / 1e6 << "M events/sec, "
+              << r.fills << " orders fully filled)" << std::endl;
+    return 0;
+  }
+
   OMS oms;
   Order o1{"ord_001",
            "AAPL",
-           Side::BUY,
+           Side::SELL,
            150.0,
            100,
            OrderStatus::NEW,
            std::chrono::system_clock::now()};
+  Order o2{"ord_002",
+           "AAPL",
+           Side::BUY,
+           150.0,
+           60,
+           OrderStatus::NEW,
+           std::chrono::system_clock::now()};
   oms.submit_order(o1);
+  oms.submit_order(o2);
   oms.process_orders();
+  for (const ExecutionReport &r : oms.drain_reports()) {
+    std::cout << "[OMS] Exec report: " << oms.client_id(r.order_id)
+              << " type=" << static_cast<int>(r.exec_type)
+              << " last_qty=" << r.last_qty << " leaves=" << r.leaves_qty
+              << " @ " << r.price << std::endl;
+  }
   return 0;
 }
+#endif
@@ -1,35 +1,100 @@
 import time
 import uuid
+from typing import List, Dict, Any
 from loguru import logger
 
 class OrderProxy:
     """
     Simulation bridge between Python strategy and C++ OMS.
+    Routes orders into the C++ matching engine (cpp_oms) when it is built,
+    else falls back to immediate simulated fills.
+    With simulate_liquidity, an order meeting an empty contra side is first
+    matched against a synthetic contra order at its own price (the bar close),
+    so it fills as in the fallback instead of resting in an empty book.
     In production, this would use IPC mechanisms like ZeroMQ or shared memory.
     """
-    
-    def __init__(self):
+
+    def __init__(self, tick_size: float = 0.01, simulate_liquidity: bool = True):
         self.order_history = {}
+        self.simulate_liquidity = simulate_liquidity
+        self._synthetic_ids = set() # engine ids of seeded contra orders
+        try:
+            import cpp_oms
+            self._oms = cpp_oms
+            self.engine = cpp_oms.MatchingEngine(tick_size)
+        except (ImportError, ModuleNotFoundError):
+            logger.info("C++ OMS module not found. Using simulated fills.")
+            self._oms = None
+            self.engine = None
 
-    def send_order(self, symbol: str, side: str, qty: int, price: float) -> str:
+    def send_order(self, symbol: str, side: str, qty: int, price: float, order_type: str = 'LIMIT') -> str:
         order_id = str(uuid.uuid4())
-        logger.info(f"Submitting order to OMS: {order_id} | {side} {qty} {symbol} @ {price}")
-        
+        logger.info(f"Submitting order to OMS: {order_id} | {order_type} {side} {qty} {symbol} @ {price}")
+
         # Simulated IPC latency
-        # time.sleep(0.001) 
-        
+        # time.sleep(0.001)
+
         self.order_history[order_id] = {
             'symbol': symbol,
             'side': side,
             'qty': qty,
             'price': price,
+            'type': order_type,
             'status': 'SUBMITTED'
         }
+
+        if self.engine is not None:
+            engine_side = self._oms.Side.BUY if side == 'BUY' else self._oms.Side.SELL
+            if self.simulate_liquidity:
+                self._seed_liquidity(symbol, side, qty, price)
+            if order_type == 'MARKET':
+                engine_id = self.engine.submit_market(symbol, engine_side, int(qty))
+            else:
+                engine_id = self.engine.submit_limit(symbol, engine_side, float(price), int(qty))
+            self.order_history[order_id]['engine_id'] = engine_id
         return order_id
 
+    def _seed_liquidity(self, symbol: str, side: str, qty: int, price: float):
+        contra_quote = self.engine.best_ask(symbol) if side == 'BUY' else self.engine.best_bid(symbol)
+        if contra_quote is not None:
+            return
+        contra_side = self._oms.Side.SELL if side == 'BUY' else self._oms.Side.BUY
+        self._synthetic_ids.add(self.engine.submit_limit(symbol, contra_side, float(price), int(qty)))
+
+    def cancel_order(self, order_id: str) -> bool:
+        order = self.order_history.get(order_id)
+        if order is None or self.engine is None:
+            return False
+        return self.engine.cancel(order['engine_id'])
+
     def get_order_status(self, order_id: str) -> str:
-        # Simulate the C++ OMS updating the status
-        if order_id in self.order_history:
-            self.order_history[order_id]['status'] = 'FILLED'
-            return 'FILLED'
-        return 'UNKNOWN'
+        if order_id not in self.order_history:
+            return 'UNKNOWN'
+        if self.engine is not None:
+            status = self.engine.status(self.order_history[order_id]['engine_id']).name
+        else:
+            # Simulate the C++ OMS updating the status
+            status = 'FILLED'
+        self.order_history[order_id]['status'] = status
+        return status
+
+    def execution_reports(self) -> List[Dict[str, Any]]:
+        """
+        Drain execution reports (fills, partial fills, cancels) from the C++ engine.
+        Reports for seeded contra orders are flagged 'synthetic'; cancel rejects
+        for ids the engine never issued carry symbol None.
+        """
+        if self.engine is None:
+            return []
+        return [{
+            'engine_id': r.order_id,
+            'contra_id': r.contra_id,
+            'symbol': None if r.symbol == self._oms.NO_SYMBOL else self.engine.symbol_name(r.symbol),
+            'side': r.side.name,
+            'exec_type': r.exec_type.name,
+            'price': r.price,
+            'last_qty': r.last_qty,
+            'leaves_qty': r.leaves_qty,
+            'seq': r.seq,
+            'synthetic': r.order_id in self._synthetic_ids
+        } for r in self.engine.drain_reports()]
@@ -1,18 +1,42 @@
 import pandas as pd
 import numpy as np
+from typing import Union
+from src.common.panel import Panel
 
-def compute_returns(df: pd.DataFrame) -> pd.DataFrame:
+Frame = Union[pd.DataFrame, Panel]
+
+def compute_returns(df: Frame) -> Frame:
     """Compute daily log-returns."""
+    if isinstance(df, Panel):
+        # Listed rows are compacted first so a listing gap does not break the series
+        close = df.compact(df['Close'])
+        returns = np.full(df.shape, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[1:] = np.log(close[1:] / close[:-1])
+        df['Returns'] = df.expand(returns)
+        return df
     df['Returns'] = np.log(df['Close'] / df['Close'].shift(1))
     return df
 
-def compute_ema(df: pd.DataFrame, span: int = 20) -> pd.DataFrame:
+def compute_ema(df: Frame, span: int = 20) -> Frame:
     """Compute Exponential Moving Average."""
+    if isinstance(df, Panel):
+        # ignore_na skips unlisted cells so each column matches its per-symbol series
+        ema = df.frame('Close').ewm(span=span, adjust=False, ignore_na=True).mean()
+        df[f'EMA_{span}'] = df.masked(ema)
+        return df
     df[f'EMA_{span}'] = df['Close'].ewm(span=span, adjust=False).mean()
     return df
 
-def compute_rsi(df: pd.DataFrame, window: int = 14) -> pd.DataFrame:
+def compute_rsi(df: Frame, window: int = 14) -> Frame:
     """Compute Relative Strength Index."""
+    if isinstance(df, Panel):
+        delta = pd.DataFrame(df.compact(df['Close'])).diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+        rs = gain / loss
+        df[f'RSI_{window}'] = df.expand(100 - (100 / (1 + rs)))
+        return df
     delta = df['Close'].diff()
     gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
     loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
@@ -21,10 +45,14 @@ def compute_rsi(df: pd.DataFrame, window: int = 14) -> pd.DataFrame:
     df[f'RSI_{window}'] = 100 - (100 / (1 + rs))
     return df
 
-def compute_volatility(df: pd.DataFrame, window: int = 20) -> pd.DataFrame:
+def compute_volatility(df: Frame, window: int = 20) -> Frame:
     """Compute rolling volatility."""
     if 'Returns' not in df.columns:
         df = compute_returns(df)
+    if isinstance(df, Panel):
+        vol = pd.DataFrame(df.compact(df['Returns'])).rolling(window=window).std() * np.sqrt(252)
+        df['Volatility'] = df.expand(vol)
+        return df
     df['Volatility'] = df['Returns'].rolling(window=window).std() * np.sqrt(252) # Annualized
     return df
 
@@ -43,19 +71,41 @@ def get_rolling_mean(df: pd.DataFrame, column: str, window: int) -> pd.Series:
             get_rolling_mean._logged = True
         return df[column].rolling(window=window).mean()
 
-def generate_features(df: pd.DataFrame) -> pd.DataFrame:
+FEATURE_COLUMNS = ['Returns', 'EMA_20', 'RSI_14', 'Volatility', 'SMA_20_Fallback']
+
+def compute_symbol_features(group: pd.DataFrame) -> pd.DataFrame:
+    """
+    Indicator set for a single ticker's date-sorted rows.
+    """
+    group = compute_returns(group)
+    group = compute_ema(group, 20)
+    group = compute_rsi(group, 14)
+    group = compute_volatility(group, 20)
+    group['SMA_20_Fallback'] = get_rolling_mean(group, 'Close', 20)
+    return group
+
+def generate_features(df: Frame, n_jobs: int = 1) -> Frame:
     """
     Calculate indicator set per ticker.
+    Panels are processed column-wise in one pass instead of per-symbol groups.
+    With n_jobs != 1, long frames are sharded by symbol across a process pool
+    (n_jobs <= 0 uses every core); the output matches the serial path.
     """
+    if isinstance(df, Panel):
+        panel = df.copy()
+        panel = compute_returns(panel)
+        panel = compute_ema(panel, 20)
+        panel = compute_rsi(panel, 14)
+        panel = compute_volatility(panel, 20)
+        panel['SMA_20_Fallback'] = panel.expand(pd.DataFrame(panel.compact(panel['Close'])).rolling(window=20).mean())
+        return panel
+
+    if n_jobs != 1:
+        from src.processing.parallel_features import generate_features_parallel
+        return generate_features_parallel(df, n_jobs)
+
     # Defensive sort
     df = df.sort_values(['Symbol', 'Date'])
     
-    def process_group(group):
-        group = compute_returns(group)
-        group = compute_ema(group, 20)
-        group = compute_rsi(group, 14)
-        group = compute_volatility(group, 20)
-        group['SMA_20_Fallback'] = get_rolling_mean(group, 'Close', 20)
-        return group
-
-    return df.groupby('Symbol', group_keys=False).apply(process_group).sort_values('Date')
+    # Stable sort keeps ties in symbol order, so output is [Date, Symbol] ordered
+    return df.groupby('Symbol', group_keys=False).apply(compute_symbol_features).sort_values('Date', kind='stable')
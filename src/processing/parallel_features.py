@@ -0,0 +1,115 @@
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Tuple
+from loguru import logger
+from src.processing.features import FEATURE_COLUMNS, compute_symbol_features
+
+def _feature_worker(close_name: str, out_name: str, n_rows: int, bounds: List[Tuple[int, int]]) -> int:
+    """
+    Compute features for a shard of symbols, reading Close from and writing
+    feature columns to shared memory. Only segment names and row bounds are pickled.
+    """
+    # Pool workers share the parent's resource tracker; the parent owns unlinking
+    close_shm = shared_memory.SharedMemory(name=close_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        close = np.ndarray((n_rows,), dtype=np.float64, buffer=close_shm.buf)
+        out = np.ndarray((len(FEATURE_COLUMNS), n_rows), dtype=np.float64, buffer=out_shm.buf)
+        for start, end in bounds:
+            group = compute_symbol_features(pd.DataFrame({'Close': close[start:end]}))
+            for k, col in enumerate(FEATURE_COLUMNS):
+                out[k, start:end] = group[col].to_numpy()
+        del close, out
+    finally:
+        close_shm.close()
+        out_shm.close()
+    return len(bounds)
+
+def _shard(bounds: List[Tuple[int, int]], n_rows: int, n_shards: int) -> List[List[Tuple[int, int]]]:
+    """Split contiguous symbol blocks into shards of roughly equal row counts."""
+    target = max(n_rows // n_shards, 1)
+    shards, current, size = [], [], 0
+    for start, end in bounds:
+        current.append((start, end))
+        size += end - start
+        if size >= target:
+            shards.append(current)
+            current, size = [], 0
+    if current:
+        shards.append(current)
+    return shards
+
+def merge_order(keys: np.ndarray, bounds: List[Tuple[int, int]]) -> np.ndarray:
+    """
+    K-way merge of sorted runs keys[start:end], as balanced pairwise merges.
+    Returns the row permutation; ties keep run order, so earlier runs come first.
+    """
+    runs = [(np.arange(start, end), keys[start:end]) for start, end in bounds]
+    if not runs:
+        return np.arange(0)
+
+    while len(runs) > 1:
+        merged = []
+        for i in range(0, len(runs) - 1, 2):
+            (idx_a, key_a), (idx_b, key_b) = runs[i], runs[i + 1]
+            pos_a = np.searchsorted(key_b, key_a, side='left') + np.arange(len(key_a))
+            pos_b = np.searchsorted(key_a, key_b, side='right') + np.arange(len(key_b))
+            idx = np.empty(len(idx_a) + len(idx_b), dtype=np.int64)
+            key = np.empty(len(idx), dtype=keys.dtype)
+            idx[pos_a], idx[pos_b] = idx_a, idx_b
+            key[pos_a], key[pos_b] = key_a, key_b
+            merged.append((idx, key))
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+
+    return runs[0][0]
+
+def generate_features_parallel(df: pd.DataFrame, n_jobs: int = -1) -> pd.DataFrame:
+    """
+    Shard symbols across a process pool and compute features per ticker.
+    Close prices and results travel through shared memory; the per-symbol
+    date-sorted runs are then combined with one k-way merge by Date.
+    """
+    if n_jobs is None or n_jobs <= 0:
+        n_jobs = os.cpu_count() or 1
+
+    # Defensive sort; leaves each symbol as one contiguous, date-sorted block
+    df = df.sort_values(['Symbol', 'Date'])
+    n_rows = len(df)
+
+    symbol_codes = pd.factorize(df['Symbol'])[0]
+    starts = np.flatnonzero(np.r_[True, symbol_codes[1:] != symbol_codes[:-1]]) if n_rows else np.arange(0)
+    bounds = list(zip(starts.tolist(), np.r_[starts[1:], n_rows].tolist()))
+    shards = _shard(bounds, n_rows, n_jobs * 4)
+    logger.info(f"Generating features for {len(bounds)} symbols across {min(n_jobs, len(shards))} processes...")
+
+    close_shm = shared_memory.SharedMemory(create=True, size=max(n_rows * 8, 1))
+    out_shm = shared_memory.SharedMemory(create=True, size=max(len(FEATURE_COLUMNS) * n_rows * 8, 1))
+    try:
+        close = np.ndarray((n_rows,), dtype=np.float64, buffer=close_shm.buf)
+        close[:] = df['Close'].to_numpy(dtype=np.float64)
+
+        with ProcessPoolExecutor(max_workers=min(n_jobs, max(len(shards), 1))) as pool:
+            futures = [pool.submit(_feature_worker, close_shm.name, out_shm.name, n_rows, shard) for shard in shards]
+            for future in futures:
+                future.result()
+
+        out = np.ndarray((len(FEATURE_COLUMNS), n_rows), dtype=np.float64, buffer=out_shm.buf)
+        df = df.copy()
+        for k, col in enumerate(FEATURE_COLUMNS):
+            df[col] = out[k].copy()
+        del close, out
+    finally:
+        close_shm.close()
+        close_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+
+    # Date may be a column or, as the serial path also accepts, the index
+    dates = df['Date'] if 'Date' in df.columns else df.index.get_level_values('Date')
+    date_keys = pd.factorize(dates, sort=True)[0]
+    return df.take(merge_order(date_keys, bounds))
@@ -0,0 +1,285 @@
+import numpy as np
+from typing import Optional, Union
+from statistics import NormalDist
+
+class RollingCovariance:
+    """
+    Incremental rolling covariance over a fixed symbol universe.
+    Keeps the centered co-moment matrix S = sum(x x') - s s' / t and moves it
+    one bar at a time with an in-place rank-4 update, so a bar costs one pass
+    over N^2 and reading a complete window's covariance is S / (t - 1).
+    Missing returns (NaN) are handled pairwise: per-pair counts and sums are
+    kept as corrections for the symbols that have gaps in the window. Reads
+    cost O(N^2) plus O(gapped * N) for the pairwise rows, so a complete window
+    pays nothing for them; a window where most names have gaps costs a dozen
+    N^2 passes, still far below a pairwise recompute over the window.
+    """
+
+    # Rows of the N x N buffers processed per step; keeps the temporaries cache-sized
+    BLOCK = 64
+
+    def __init__(self, n_symbols: int, window: int = 60, min_periods: Optional[int] = None, shrinkage: Union[None, str, float] = None):
+        if window < 2:
+            raise ValueError("Covariance window must be at least 2")
+        if isinstance(shrinkage, str) and shrinkage != 'ledoit_wolf':
+            raise ValueError(f"Unsupported shrinkage: {shrinkage}")
+        self.n_symbols = n_symbols
+        self.window = window
+        self.min_periods = window if min_periods is None else max(min_periods, 2)
+        self.shrinkage = shrinkage
+
+        # Ring buffer of the last `window` bars (zero-filled) and their validity flags
+        self._values = np.zeros((window, n_symbols))
+        self._valid = np.zeros((window, n_symbols))
+        self._pos = 0
+        self._updates = 0
+
+        # Running sums over the window: sum of x_i, count of valid x_i, and the
+        # co-moment sum(x_i * x_j) - s_i * s_j / t (missing values count as zero)
+        self._sums = np.zeros(n_symbols)
+        self._counts = np.zeros(n_symbols)
+        self._comoment = np.zeros((n_symbols, n_symbols))
+
+        # Pairwise corrections, nonzero only in the rows/columns of symbols with gaps:
+        # sum of x_i over bars where j is missing, and bars where both are missing
+        self._miss_sum = np.zeros((n_symbols, n_symbols))
+        self._miss_both = np.zeros((n_symbols, n_symbols))
+
+    @property
+    def n_obs(self) -> int:
+        return min(self._updates, self.window)
+
+    def update(self, returns: np.ndarray):
+        """
+        Push one bar of returns (length n_symbols, NaN for missing).
+        """
+        returns = np.asarray(returns, dtype=float)
+        valid = ~np.isnan(returns)
+        new_x = np.where(valid, returns, 0.0)
+        evicting = self._updates >= self.window
+        old_x = self._values[self._pos].copy()
+        old_v = self._valid[self._pos].copy()
+
+        self._values[self._pos] = new_x
+        self._valid[self._pos] = valid
+        self._pos = (self._pos + 1) % self.window
+        self._updates += 1
+
+        # Rebuild from the buffer once per window to stop add/subtract drift
+        if self._updates % self.window == 0:
+            self._rebuild()
+            return
+
+        t_old, s_old = min(self._updates - 1, self.window), self._sums.copy()
+        self._sums += new_x
+        self._counts += valid
+        self._add_missing(new_x, np.flatnonzero(~valid), 1.0)
+        if evicting:
+            self._sums -= old_x
+            self._counts -= old_v
+            self._add_missing(old_x, np.flatnonzero(old_v == 0), -1.0)
+
+        # S_new - S_old = x x' - y y' + s_old s_old' / t_old - s_new s_new' / t_new,
+        # applied as one (N x 4)(4 x N) product per row block
+        u = np.stack([new_x, old_x, s_old / np.sqrt(max(t_old, 1)), self._sums / np.sqrt(self.n_obs)])
+        v = u * np.array([1.0, -1.0, 1.0, -1.0])[:, None]
+        for r in range(0, self.n_symbols, self.BLOCK):
+            self._comoment[r:r + self.BLOCK] += u[:, r:r + self.BLOCK].T @ v
+
+    def _add_missing(self, x: np.ndarray, missing: np.ndarray, sign: float):
+        if missing.size == 0:
+            return
+        self._miss_sum[:, missing] += sign * x[:, None]
+        self._miss_both[np.ix_(missing, missing)] += sign
+
+    def _rebuild(self):
+        # Only called with a full buffer, so every row is a real bar
+        missing = 1.0 - self._valid
+        self._sums = self._values.sum(axis=0)
+        self._counts = self._valid.sum(axis=0)
+        np.dot(self._values.T, self._values, out=self._comoment)
+        self._comoment -= np.multiply.outer(self._sums, self._sums / self.window)
+        self._miss_sum[:] = 0.0
+        self._miss_both[:] = 0.0
+        gaps = np.flatnonzero(missing.any(axis=0))
+        if gaps.size:
+            self._miss_sum[:, gaps] = self._values.T @ missing[:, gaps]
+            self._miss_both[np.ix_(gaps, gaps)] = missing[:, gaps].T @ missing[:, gaps]
+
+    def covariance(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Pairwise sample covariance; NaN where a pair has fewer than min_periods observations.
+        Pass `idx` to get only that sub-block, at O(len(idx)^2) rather than O(N^2).
+        """
+        cov = self._sample_covariance(idx)
+        if self.shrinkage is None:
+            return cov
+        intensity = self._ledoit_wolf(cov, idx) if self.shrinkage == 'ledoit_wolf' else float(self.shrinkage)
+        return shrink_covariance(cov, intensity, out=cov)
+
+    def correlation(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        cov = self.covariance(idx)
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return cov / np.outer(std, std)
+
+    def shrinkage_intensity(self, idx: Optional[np.ndarray] = None) -> float:
+        """
+        Ledoit-Wolf (2004) optimal intensity towards a scaled identity target.
+        """
+        return self._ledoit_wolf(self._sample_covariance(idx), idx)
+
+    def _sample_covariance(self, idx: Optional[np.ndarray]) -> np.ndarray:
+        t = self.n_obs
+        idx = np.arange(self.n_symbols) if idx is None else np.asarray(idx)
+        n = idx.size
+        if t < self.min_periods:
+            return np.full((n, n), np.nan)
+
+        full = n == self.n_symbols
+        cov = self._comoment / (t - 1) if full else self._comoment[np.ix_(idx, idx)] / (t - 1)
+
+        # Pairs involving a symbol with gaps in the window need the pairwise formula
+        missed = t - self._counts[idx]
+        gaps = np.flatnonzero(missed)
+        if gaps.size == 0:
+            return cov
+        sums = self._sums[idx]
+        # Pairs can only fall below min_periods in columns with enough gaps
+        short = np.flatnonzero(missed > t - self.min_periods - missed.max())
+        pairwise = np.empty((gaps.size, n))
+        # One block of gap rows at a time, so the temporaries stay cache-sized
+        for r in range(0, gaps.size, self.BLOCK):
+            pos = gaps[r:r + self.BLOCK]
+            rows = idx[pos]
+            block = pairwise[r:r + self.BLOCK]
+
+            # Pairwise counts, sums and cross products from the gap corrections
+            count = self._block(self._miss_both, rows, idx, full)
+            count += np.subtract.outer(t - missed[pos], missed)
+            sum_row = self._block(self._miss_sum, rows, idx, full)
+            np.subtract(sums[pos, None], sum_row, out=sum_row)
+            # Contiguous copy of the transposed column block; arithmetic on the view is slow
+            sum_col = np.ascontiguousarray((self._miss_sum[:, rows] if full else self._miss_sum[np.ix_(idx, rows)]).T)
+            np.subtract(sums, sum_col, out=sum_col)
+            np.multiply.outer(sums[pos], sums / t, out=block)
+            block += self._block(self._comoment, rows, idx, full)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sum_row *= sum_col
+                sum_row /= count
+                block -= sum_row
+                count -= 1
+                block /= count
+            if short.size:
+                low = count[:, short] < self.min_periods - 1
+                block[:, short] = np.where(low, np.nan, block[:, short])
+
+        cov[gaps] = pairwise
+        cov[:, gaps] = pairwise.T
+        return cov
+
+    @staticmethod
+    def _block(matrix: np.ndarray, rows: np.ndarray, idx: np.ndarray, full: bool) -> np.ndarray:
+        """Copy of matrix[rows][:, idx]; a plain row gather when idx is every symbol."""
+        return matrix[rows] if full else matrix[np.ix_(rows, idx)]
+
+    def _ledoit_wolf(self, cov: np.ndarray, idx: Optional[np.ndarray]) -> float:
+        """
+        Intensity from the running-sum covariance plus per-bar norms of the
+        demeaned window: O(N^2 + window * N), no pass over window * N^2.
+        The biased covariance is taken as (t - 1) / t times the pairwise one, which
+        is exact for complete windows and an approximation when returns are missing.
+        """
+        t = self.n_obs
+        if t < 2:
+            return 1.0
+        values = self._values if idx is None else self._values[:, idx]
+        valid = self._valid if idx is None else self._valid[:, idx]
+        counts = self._counts if idx is None else self._counts[idx]
+        sums = self._sums if idx is None else self._sums[idx]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.where(counts > 0, sums / counts, 0.0)
+
+        # Squared norm of each demeaned bar; unfilled buffer rows are all zero
+        sq_norms = np.einsum('ij,ij->i', values, values) - 2 * values @ means + valid @ means ** 2
+
+        scale = (t - 1) / t
+        sq_sum = np.vdot(cov, cov)
+        if np.isnan(sq_sum):
+            sq_sum = np.nansum(cov * cov)
+        n = cov.shape[0]
+        trace = np.nansum(np.diag(cov)) * scale
+        mu = trace / n
+        beta_ = np.sum(sq_norms ** 2) / t
+        delta_ = sq_sum * scale ** 2
+        beta = (beta_ - delta_) / (n * t)
+        delta = (delta_ - 2 * mu * trace + n * mu ** 2) / n
+        if delta <= 0:
+            return 1.0
+        return float(np.clip(beta / delta, 0.0, 1.0))
+
+def shrink_covariance(cov: np.ndarray, intensity: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Blend covariance with a scaled identity: (1 - a) * S + a * mu * I. Pass out=cov to shrink in place."""
+    n = cov.shape[0]
+    diag = np.diag(cov)
+    mu = np.nanmean(diag) if n and not np.isnan(diag).all() else 0.0
+    shrunk = np.multiply(cov, 1 - intensity, out=out)
+    shrunk.flat[::n + 1] += intensity * mu
+    return shrunk
+
+def risk_parity_weights(cov: np.ndarray, budgets: Optional[np.ndarray] = None, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+    """
+    Equal risk contribution (or custom budgets) long-only weights summing to one.
+    Newton's method on the convex formulation 0.5 * y'Sy - sum(b * log(y)).
+    """
+    n = cov.shape[0]
+    b = np.full(n, 1.0 / n) if budgets is None else np.asarray(budgets, dtype=float) / np.sum(budgets)
+    y = b / np.sqrt(np.diag(cov))
+
+    for _ in range(max_iter):
+        grad = cov @ y - b / y
+        if np.max(np.abs(grad)) < tol:
+            break
+        hess = cov + np.diag(b / y ** 2)
+        step = np.linalg.solve(hess, grad)
+        # Halve the step until all weights stay strictly positive
+        t = 1.0
+        while np.any(y - t * step <= 0):
+            t *= 0.5
+        y = y - t * step
+
+    return y / y.sum()
+
+def min_variance_weights(cov: np.ndarray, long_only: bool = True, max_iter: int = 50) -> np.ndarray:
+    """
+    Minimum-variance weights summing to one.
+    With long_only, symbols with negative weights are dropped and the rest re-solved.
+    """
+    n = cov.shape[0]
+    active = np.ones(n, dtype=bool)
+    weights = np.zeros(n)
+
+    for _ in range(max_iter):
+        sub = cov[np.ix_(active, active)]
+        raw = np.linalg.solve(sub, np.ones(active.sum()))
+        weights[:] = 0.0
+        weights[active] = raw / raw.sum()
+        if not long_only or np.all(weights >= 0):
+            break
+        active &= weights > 0
+
+    return weights
+
+def portfolio_volatility(weights: np.ndarray, cov: np.ndarray) -> float:
+    """Per-bar portfolio standard deviation sqrt(w'Sw)."""
+    return float(np.sqrt(max(weights @ cov @ weights, 0.0)))
+
+def component_var(weights: np.ndarray, cov: np.ndarray, confidence: float = 0.99) -> np.ndarray:
+    """
+    Parametric (Gaussian) component VaR per position; the components sum to portfolio VaR.
+    """
+    sigma = portfolio_volatility(weights, cov)
+    if sigma == 0:
+        return np.zeros_like(weights)
+    z = NormalDist().inv_cdf(confidence)
+    return z * weights * (cov @ weights) / sigma
@@ -1,21 +1,35 @@
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, List, Optional
 from loguru import logger
+from src.risk.covariance import portfolio_volatility, component_var
 
 class RiskManager:
     """
     Handles pre-trade risk compliance and drawdown tracking.
+    Portfolio-level limits apply once a return covariance is supplied via update_covariance.
     """
     
-    def __init__(self, max_pos_size: float = 0.2, max_leverage: float = 1.0, max_drawdown: float = 0.1):
+    def __init__(self, max_pos_size: float = 0.2, max_leverage: float = 1.0, max_drawdown: float = 0.1,
+                 max_portfolio_vol: Optional[float] = None, max_component_var: Optional[float] = None,
+                 var_confidence: float = 0.99):
         self.max_pos_size = max_pos_size 
         self.max_leverage = max_leverage
         self.max_drawdown = max_drawdown
+        self.max_portfolio_vol = max_portfolio_vol # annualized
+        self.max_component_var = max_component_var # per-bar VaR as a fraction of capital
+        self.var_confidence = var_confidence
         self.current_drawdown = 0.0
+        self.covariance = None
+        self.cov_symbols = []
 
-    def check_trade(self, symbol: str, quantity: float, price: float, total_capital: float, current_positions: Dict[str, float]) -> bool:
+    def check_trade(self, symbol: str, quantity: float, price: float, total_capital: float, current_positions: Dict[str, float],
+                    prices: Optional[Dict[str, float]] = None) -> bool:
         """
         Perform pre-trade risk checks.
         Returns True if trade is approved.
+        `prices` gives spot prices for held symbols. With portfolio vol/VaR limits
+        configured, a trade is rejected if any held symbol has no quote or is not
+        covered by the covariance, since its risk cannot be evaluated.
         """
         trade_value = abs(quantity) * price
         
@@ -34,9 +48,48 @@ class RiskManager:
         if self.current_drawdown > self.max_drawdown:
             logger.warning(f"Risk Check Failed: System-wide drawdown limit reached")
             return False
+
+        # 4. Correlation-aware portfolio checks
+        if self.covariance is not None and (self.max_portfolio_vol is not None or self.max_component_var is not None):
+            post_trade = dict(current_positions)
+            post_trade[symbol] = post_trade.get(symbol, 0.0) + quantity
+            quotes = dict(prices or {})
+            quotes[symbol] = price
+
+            held = [s for s, q in post_trade.items() if abs(q) > 1e-6]
+            missing = [s for s in held if s not in quotes]
+            if missing:
+                logger.warning(f"Risk Check Failed: No quote for held symbols {missing}")
+                return False
+            uncovered = [s for s in held if s not in self.cov_symbols]
+            if uncovered:
+                logger.warning(f"Risk Check Failed: No covariance for held symbols {uncovered}")
+                return False
+
+            weights = np.array([post_trade.get(s, 0.0) * quotes.get(s, 0.0) / total_capital for s in self.cov_symbols])
+
+            if self.max_portfolio_vol is not None:
+                port_vol = portfolio_volatility(weights, self.covariance) * np.sqrt(252)
+                if port_vol > self.max_portfolio_vol:
+                    logger.warning(f"Risk Check Failed: Portfolio volatility ({port_vol:.4f}) exceeds limit ({self.max_portfolio_vol})")
+                    return False
+
+            if self.max_component_var is not None and symbol in self.cov_symbols:
+                comp_var = component_var(weights, self.covariance, self.var_confidence)[self.cov_symbols.index(symbol)]
+                if comp_var > self.max_component_var:
+                    logger.warning(f"Risk Check Failed: Component VaR for {symbol} ({comp_var:.4f}) exceeds limit ({self.max_component_var})")
+                    return False
             
         return True
 
+    def update_covariance(self, covariance: np.ndarray, symbols: List[str]):
+        """
+        Set the per-bar return covariance (e.g. from RollingCovariance) used for portfolio limits.
+        NaN entries are treated as zero.
+        """
+        self.covariance = np.nan_to_num(np.asarray(covariance, dtype=float))
+        self.cov_symbols = list(symbols)
+
     def update_metrics(self, equity_curve: list):
         # Update current drawdown based on equity curve
         if not equity_curve:
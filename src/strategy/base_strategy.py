@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 import pandas as pd
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, List
+from src.common.panel import Panel
 
 class BaseStrategy(ABC):
     """
@@ -17,3 +19,24 @@ class BaseStrategy(ABC):
         Produce a dataframe with target positions or signals.
         """
         pass
+
+    def generate_panel_signals(self, panel: Panel) -> Panel:
+        """
+        Produce a panel with target positions or signals.
+        Falls back to a round trip through the long frame; override with array ops.
+        """
+        return Panel.from_long(self.generate_signals(panel.to_long()))
+
+    def generate_signals_batch(self, df: pd.DataFrame, param_sets: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Target positions for many parameter sets, stacked as (params x dates x symbols)
+        on the axes of Panel.from_long(df). Runs one strategy per set by default;
+        override to share work across the parameter axis.
+        """
+        panel = df if isinstance(df, Panel) else Panel.from_long(df)
+        targets = np.empty((len(param_sets),) + panel.shape)
+        for k, params in enumerate(param_sets):
+            strategy = type(self)(**{**self.config, **params})
+            signals = strategy.generate_panel_signals(panel).reindex(panel.dates, panel.symbols)
+            targets[k] = signals['Target_Position']
+        return targets
@@ -1,18 +1,40 @@
+import warnings
 import pandas as pd
+import numpy as np
+from typing import Union, List, Dict, Any
 from .base_strategy import BaseStrategy
+from src.common.panel import Panel
+from src.risk.covariance import RollingCovariance, risk_parity_weights, min_variance_weights
 
 class MovingAverageCross(BaseStrategy):
     """
     Simple Moving Average Crossover strategy.
     Long when fast EMA > slow EMA, short otherwise.
+    Active names are weighted by inverse volatility, or by full risk-parity /
+    minimum-variance weights from a rolling covariance of returns.
     """
-    
-    def __init__(self, fast_window: int = 10, slow_window: int = 30):
-        super().__init__({"fast_window": fast_window, "slow_window": slow_window})
+
+    # Normalize exposure. Using 0.95 to account for execution buffer.
+    TOTAL_EXPOSURE = 0.95
+    # Cells (params x dates x symbols) per chunk of generate_signals_batch temporaries
+    BATCH_CELLS = 1 << 22
+
+    def __init__(self, fast_window: int = 10, slow_window: int = 30, weighting: str = "inverse_vol",
+                 cov_window: int = 60, shrinkage: Union[None, str, float] = "ledoit_wolf"):
+        if weighting not in ("inverse_vol", "risk_parity", "min_variance"):
+            raise ValueError(f"Unsupported weighting: {weighting}")
+        super().__init__({"fast_window": fast_window, "slow_window": slow_window, "weighting": weighting,
+                          "cov_window": cov_window, "shrinkage": shrinkage})
         self.fast_window = fast_window
         self.slow_window = slow_window
+        self.weighting = weighting
+        self.cov_window = cov_window
+        self.shrinkage = shrinkage
+
+    def generate_signals(self, df: Union[pd.DataFrame, Panel]) -> Union[pd.DataFrame, Panel]:
+        if isinstance(df, Panel):
+            return self.generate_panel_signals(df)
 
-    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         # Sort by ticker and time
         df = df.sort_values(['Symbol', 'Date']).copy()
         
@@ -23,6 +45,17 @@ class MovingAverageCross(BaseStrategy):
             return group
 
         df = df.groupby('Symbol', group_keys=False).apply(process_group)
+
+        if self.weighting != "inverse_vol":
+            panel = Panel.from_long(df, fields=['EMA_Fast', 'EMA_Slow', 'Returns'])
+            active = panel['EMA_Fast'] > panel['EMA_Slow']
+            target = np.where(active, self._covariance_weights(panel, active) * self.TOTAL_EXPOSURE, 0.0)
+
+            row = panel.dates.get_indexer(df['Date'])
+            col = panel.symbols.get_indexer(df['Symbol'])
+            df['Target_Position'] = target[row, col]
+            df['Signal'] = active[row, col].astype(int)
+            return df.sort_values('Date')
         
         def calculate_weights(daily_group):
             # All symbols start with zero allocation
@@ -41,11 +74,113 @@ class MovingAverageCross(BaseStrategy):
                 vol = daily_group.loc[active_mask, 'Volatility'].fillna(daily_group['Volatility'].mean()).clip(lower=0.0001)
                 inv_vol = 1.0 / vol
                 weights = inv_vol / inv_vol.sum()
-                
-                # Normalize exposure. Using 0.95 to account for execution buffer.
-                total_exposure = 0.95
-                daily_group.loc[active_mask, 'Target_Position'] = weights * total_exposure
+                daily_group.loc[active_mask, 'Target_Position'] = weights * self.TOTAL_EXPOSURE
                 
             return daily_group
 
         return df.groupby('Date', group_keys=False).apply(calculate_weights).sort_values('Date')
+
+
+    def generate_panel_signals(self, panel: Panel) -> Panel:
+        """
+        Vectorized crossover and inverse-volatility weighting over the whole panel.
+        """
+        panel = panel.copy()
+        close = panel.frame('Close')
+        panel['EMA_Fast'] = panel.masked(close.ewm(span=self.fast_window, adjust=False, ignore_na=True).mean())
+        panel['EMA_Slow'] = panel.masked(close.ewm(span=self.slow_window, adjust=False, ignore_na=True).mean())
+
+        # Trend following: entry when fast EMA > slow EMA
+        active = panel['EMA_Fast'] > panel['EMA_Slow']
+        panel['Signal'] = panel.masked(active.astype(float))
+
+        if self.weighting != "inverse_vol":
+            panel['Target_Position'] = panel.masked(np.where(active, self._covariance_weights(panel, active) * self.TOTAL_EXPOSURE, 0.0))
+            return panel
+
+        panel['Target_Position'] = panel.masked(np.where(active, self._inverse_vol_weights(panel, active) * self.TOTAL_EXPOSURE, 0.0))
+        return panel
+
+    def generate_signals_batch(self, df: Union[pd.DataFrame, Panel], param_sets: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Evaluate many (fast_window, slow_window) pairs at once. Each distinct span's
+        EMA and the inverse volatility are computed once over the shared panel;
+        signals and weights are then vectorized across chunks of the parameter
+        axis, so temporaries stay within BATCH_CELLS cells besides the output.
+        """
+        if self.weighting != "inverse_vol" or any(set(p) - {"fast_window", "slow_window"} for p in param_sets):
+            return super().generate_signals_batch(df, param_sets)
+
+        panel = df if isinstance(df, Panel) else Panel.from_long(df)
+        fast = np.array([p.get("fast_window", self.fast_window) for p in param_sets])
+        slow = np.array([p.get("slow_window", self.slow_window) for p in param_sets])
+        spans = np.unique(np.r_[fast, slow])
+
+        close = panel.frame('Close')
+        emas = np.stack([close.ewm(span=span, adjust=False, ignore_na=True).mean().to_numpy() for span in spans])
+        fast, slow = np.searchsorted(spans, fast), np.searchsorted(spans, slow)
+        inv_vol = self._inverse_vol(panel)
+
+        targets = np.empty((len(param_sets),) + panel.shape)
+        chunk = max(self.BATCH_CELLS // max(panel.mask.size, 1), 1)
+        for start in range(0, len(param_sets), chunk):
+            rows = slice(start, start + chunk)
+            active = np.empty(targets[rows].shape, dtype=bool)
+            for j in range(len(active)):
+                np.greater(emas[fast[start + j]], emas[slow[start + j]], out=active[j])
+            active &= panel.mask
+            # Same steps as _inverse_vol_weights, in place on the chunk's output
+            weights = targets[rows]
+            np.multiply(active, inv_vol, out=weights)
+            with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+                warnings.simplefilter('ignore', category=RuntimeWarning)
+                weights /= np.nansum(weights, axis=-1, keepdims=True)
+            weights *= self.TOTAL_EXPOSURE
+            weights[~active] = 0.0
+            weights[:, ~panel.mask] = np.nan
+        return targets
+
+    def _inverse_vol_weights(self, panel: Panel, active: np.ndarray) -> np.ndarray:
+        """
+        Risk Parity: fill missing vol with the cross-sectional mean, then scale inversely.
+        `active` is (dates x symbols) or stacked with leading parameter axes.
+        """
+        inv_vol = np.where(active, self._inverse_vol(panel), 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            return inv_vol / np.nansum(inv_vol, axis=-1, keepdims=True)
+
+    def _inverse_vol(self, panel: Panel) -> np.ndarray:
+        """1 / volatility, missing vol filled with the cross-sectional mean and floored."""
+        vol = panel.masked(panel['Volatility'])
+        with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            daily_mean = np.nanmean(vol, axis=1, keepdims=True)
+            return 1.0 / np.clip(np.where(np.isnan(vol), daily_mean, vol), 0.0001, None)
+
+    def _covariance_weights(self, panel: Panel, active: np.ndarray) -> np.ndarray:
+        """
+        Walk the return panel bar by bar, updating the rolling covariance and solving
+        weights over each day's active names. Names without enough covariance history
+        yet get a weight of 0 and the rest are solved without them.
+        """
+        returns = panel.masked(panel['Returns'])
+        engine = RollingCovariance(panel.shape[1], window=self.cov_window, min_periods=self.cov_window // 2, shrinkage=self.shrinkage)
+        solver = risk_parity_weights if self.weighting == "risk_parity" else min_variance_weights
+        weights = np.zeros(panel.shape)
+
+        for i in range(panel.shape[0]):
+            engine.update(returns[i])
+            idx = np.flatnonzero(active[i])
+            if idx.size == 0:
+                continue
+            cov = engine.covariance(idx)
+            # Drop the least-seasoned names until the remaining pairs are all warm
+            while idx.size and np.isnan(cov).any():
+                worst = np.argmax(np.isnan(cov).sum(axis=0))
+                keep = np.arange(idx.size) != worst
+                idx, cov = idx[keep], cov[np.ix_(keep, keep)]
+            if idx.size:
+                weights[i, idx] = solver(cov)
+
+        return weights
@@ -0,0 +1,26 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add repo root to path, as main.py does
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+@pytest.fixture
+def ragged_bars():
+    """Symbols with staggered listings, early delistings and interior listing gaps."""
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2024-01-01", periods=160, tz="UTC")
+    rows = []
+    for k in range(6):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, len(dates))))
+        listed = np.zeros(len(dates), dtype=bool)
+        listed[rng.integers(0, 30):len(dates) - (15 if k % 3 == 0 else 0)] = True
+        if k % 2 == 0:
+            gap = rng.integers(50, 100)
+            listed[gap:gap + 5] = False
+        for i in np.flatnonzero(listed):
+            rows.append((dates[i], f"S{k}", close[i], 1e6))
+    df = pd.DataFrame(rows, columns=["Date", "Symbol", "Close", "Volume"])
+    return df.sample(frac=1, random_state=0).reset_index(drop=True)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from src.common.panel import Panel
+from src.processing.features import generate_features
+from src.strategy.ma_cross import MovingAverageCross
+
+PARAM_SETS = [{'fast_window': f, 'slow_window': s} for f in (3, 5, 10) for s in (12, 20, 30)]
+
+def test_batch_matches_single_runs(ragged_bars, monkeypatch):
+    features = generate_features(ragged_bars.copy())
+    panel = Panel.from_long(features)
+    # Several parameter chunks, the last one partial
+    monkeypatch.setattr(MovingAverageCross, 'BATCH_CELLS', 4 * panel.mask.size)
+
+    targets = MovingAverageCross().generate_signals_batch(features, PARAM_SETS)
+    assert targets.shape == (len(PARAM_SETS),) + panel.shape
+    for k, params in enumerate(PARAM_SETS):
+        signals = Panel.from_long(MovingAverageCross(**params).generate_signals(features.copy()))
+        expected = signals.reindex(panel.dates, panel.symbols)['Target_Position']
+        np.testing.assert_allclose(targets[k], expected, atol=1e-12, equal_nan=True, err_msg=str(params))
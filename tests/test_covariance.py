@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from src.common.panel import Panel
+from src.risk.covariance import RollingCovariance, risk_parity_weights, min_variance_weights, component_var, portfolio_volatility
+from src.risk.risk_manager import RiskManager
+from src.strategy.ma_cross import MovingAverageCross
+
+def _returns(n_bars=150, n_symbols=12, missing=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    mix = np.eye(n_symbols) + 0.3 * rng.normal(size=(n_symbols, n_symbols))
+    returns = rng.normal(0, 0.01, (n_bars, n_symbols)) @ mix
+    returns[rng.random(returns.shape) < missing] = np.nan
+    return returns
+
+def _ledoit_wolf_reference(x):
+    """Textbook Ledoit-Wolf intensity on a complete, demeaned sample."""
+    t, n = x.shape
+    s = x.T @ x / t
+    mu = np.trace(s) / n
+    beta = (np.sum((x ** 2).sum(axis=1) ** 2) / t - np.sum(s ** 2)) / (n * t)
+    delta = (np.sum(s ** 2) - 2 * mu * np.trace(s) + n * mu ** 2) / n
+    return min(max(beta / delta, 0.0), 1.0)
+
+def test_incremental_matches_window_recompute():
+    returns = _returns(missing=0.05)
+    returns[:70, 3] = np.nan # late listing
+    engine = RollingCovariance(returns.shape[1], window=40, min_periods=20)
+    for i, row in enumerate(returns):
+        engine.update(row)
+        if i in (10, 39, 40, 75, 97, 149):
+            expected = pd.DataFrame(returns[max(0, i - 39):i + 1]).cov(min_periods=20).to_numpy()
+            np.testing.assert_allclose(engine.covariance(), expected, equal_nan=True, atol=1e-14)
+
+    idx = np.array([1, 5, 9])
+    np.testing.assert_allclose(engine.covariance(idx), engine.covariance()[np.ix_(idx, idx)], equal_nan=True)
+
+def test_ledoit_wolf_intensity():
+    returns = _returns()
+    engine = RollingCovariance(returns.shape[1], window=60)
+    for row in returns:
+        engine.update(row)
+    window = returns[-60:] - returns[-60:].mean(axis=0)
+    assert np.isclose(engine.shrinkage_intensity(), _ledoit_wolf_reference(window))
+
+def test_weight_solvers_and_var():
+    engine = RollingCovariance(12, window=60, shrinkage='ledoit_wolf')
+    for row in _returns():
+        engine.update(row)
+    cov = engine.covariance()
+
+    weights = risk_parity_weights(cov)
+    contributions = weights * (cov @ weights)
+    assert np.isclose(weights.sum(), 1.0)
+    np.testing.assert_allclose(contributions, contributions.mean(), rtol=1e-6)
+
+    min_var = min_variance_weights(cov)
+    assert np.isclose(min_var.sum(), 1.0) and (min_var >= 0).all()
+    assert min_var @ cov @ min_var <= weights @ cov @ weights
+
+    assert np.isclose(component_var(weights, cov, 0.99).sum(), 2.3263478740408408 * portfolio_volatility(weights, cov))
+
+def test_late_listing_does_not_blank_seasoned_names():
+    rng = np.random.default_rng(1)
+    dates = pd.bdate_range("2024-01-01", periods=120, tz="UTC")
+    rows = []
+    for k in range(4):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.003, 0.01, len(dates))))
+        for i in range(80 if k == 3 else 0, len(dates)):
+            rows.append((dates[i], f"S{k}", close[i]))
+    panel = Panel.from_long(pd.DataFrame(rows, columns=["Date", "Symbol", "Close"]))
+    panel['Returns'] = np.vstack([np.full((1, 4), np.nan), np.log(panel['Close'][1:] / panel['Close'][:-1])])
+    panel['Volatility'] = np.full(panel.shape, 0.2)
+
+    signals = MovingAverageCross(5, 20, weighting="risk_parity", cov_window=40).generate_panel_signals(panel)
+    targets = signals['Target_Position']
+    assert not np.isnan(targets[panel.mask]).any()
+    assert (targets[80:99, 3] == 0).all()
+    assert (targets[80:99, :3].sum(axis=1) > 0.9).all()
+
+def test_risk_manager_rejects_unpriced_portfolio():
+    risk = RiskManager(max_pos_size=1.0, max_portfolio_vol=0.5)
+    risk.update_covariance(np.eye(2) * 1e-4, ["AAPL", "MSFT"])
+    # Fully quoted: 25% / 75% in two uncorrelated names at ~12% annualized vol is within the limit
+    assert risk.check_trade("AAPL", 100, 100.0, 40000, {"MSFT": 100}, {"MSFT": 300.0})
+    # MSFT unquoted: its risk cannot be evaluated, so the gate fails closed
+    assert not risk.check_trade("AAPL", 100, 100.0, 40000, {"MSFT": 100})
+    # NVDA held but outside the covariance universe
+    assert not risk.check_trade("AAPL", 100, 100.0, 40000, {"NVDA": 10}, {"NVDA": 100.0})
+    risk.max_portfolio_vol = 0.01
+    assert not risk.check_trade("AAPL", 100, 100.0, 40000, {"MSFT": 100}, {"MSFT": 300.0})
@@ -0,0 +1,120 @@
+import resource
+
+import pytest
+
+cpp_oms = pytest.importorskip("cpp_oms")
+
+from src.execution.order_proxy import OrderProxy
+
+BUY, SELL = cpp_oms.Side.BUY, cpp_oms.Side.SELL
+ExecType, OrderStatus = cpp_oms.ExecType, cpp_oms.OrderStatus
+
+def _fills(reports, order_id):
+    return [(r.price, r.last_qty) for r in reports
+            if r.order_id == order_id and r.exec_type in (ExecType.FILL, ExecType.PARTIAL_FILL)]
+
+def test_price_time_priority_and_partial_fills():
+    engine = cpp_oms.MatchingEngine(0.01)
+    first = engine.submit_limit("AAPL", SELL, 100.0, 30)
+    second = engine.submit_limit("AAPL", SELL, 100.0, 30)
+    better = engine.submit_limit("AAPL", SELL, 99.99, 10)
+    engine.drain_reports()
+
+    taker = engine.submit_limit("AAPL", BUY, 100.0, 50)
+    reports = engine.drain_reports()
+
+    # Best price first, then FIFO within the level
+    assert [r.order_id for r in reports if r.order_id != taker and r.last_qty] == [better, first, second]
+    assert _fills(reports, taker) == [(pytest.approx(99.99), 10), (pytest.approx(100.0), 30), (pytest.approx(100.0), 10)]
+    assert engine.status(taker) == OrderStatus.FILLED
+    assert engine.status(first) == OrderStatus.FILLED
+    assert engine.status(second) == OrderStatus.PARTIALLY_FILLED
+    assert engine.leaves_qty(second) == 20
+    assert engine.depth("AAPL", SELL, 100.0) == 20
+    assert engine.best_ask("AAPL") == pytest.approx(100.0)
+    assert engine.best_bid("AAPL") is None
+
+def test_cancel_after_fill_keeps_order_symbol():
+    engine = cpp_oms.MatchingEngine(0.01)
+    engine.submit_limit("AAA", BUY, 10.0, 5)
+    maker = engine.submit_limit("MSFT", SELL, 50.0, 5)
+    engine.submit_limit("MSFT", BUY, 50.0, 5)
+    engine.drain_reports()
+
+    assert not engine.cancel(maker)
+    (reject,) = engine.drain_reports()
+    assert reject.exec_type == ExecType.REJECTED
+    assert engine.symbol_name(reject.symbol) == "MSFT"
+    assert reject.side == SELL
+
+def test_cancel_unknown_id_uses_sentinel():
+    engine = cpp_oms.MatchingEngine()
+    assert not engine.cancel(5)
+    (reject,) = engine.drain_reports()
+    assert reject.symbol == cpp_oms.NO_SYMBOL
+    with pytest.raises(IndexError):
+        engine.symbol_name(reject.symbol)
+
+def test_market_order_against_empty_book_is_cancelled():
+    engine = cpp_oms.MatchingEngine()
+    order = engine.submit_market("AAPL", BUY, 10)
+    reports = engine.drain_reports()
+    assert [r.exec_type for r in reports] == [ExecType.NEW, ExecType.CANCELLED]
+    assert engine.status(order) == OrderStatus.CANCELLED
+    assert engine.best_ask("AAPL") is None
+
+def test_invalid_and_far_prices_are_rejected_without_growth():
+    engine = cpp_oms.MatchingEngine(0.01, max_levels=1 << 12)
+    for price in (float('nan'), 0.0, -1.0, float('inf')):
+        assert engine.status(engine.submit_limit("AAPL", BUY, price, 1)) == OrderStatus.REJECTED
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    near = engine.submit_limit("AAPL", BUY, 1.00, 1)
+    far = engine.submit_limit("AAPL", BUY, 1000000.00, 1)
+    for price in (1e-2, 5e5, 1e7):
+        engine.depth("AAPL", SELL, price)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    assert engine.status(near) == OrderStatus.NEW
+    assert engine.status(far) == OrderStatus.REJECTED
+    assert engine.best_bid("AAPL") == pytest.approx(1.00)
+    assert rss_after - rss_before < 50 * 1024 # KiB
+
+    # Once the side empties the window re-anchors at the new price
+    assert engine.cancel(near)
+    assert engine.status(engine.submit_limit("AAPL", BUY, 1000000.00, 1)) == OrderStatus.NEW
+
+def test_unrestable_remainder_of_partial_fill_is_cancelled():
+    engine = cpp_oms.MatchingEngine(0.01, max_levels=1 << 12)
+    engine.submit_limit("AAPL", BUY, 10.00, 1)
+    engine.submit_limit("AAPL", SELL, 10.01, 5)
+    engine.drain_reports()
+
+    # Sweeps the ask at 10.01; the remainder at 100.00 is outside the bid window
+    order = engine.submit_limit("AAPL", BUY, 100.00, 8)
+    reports = [r for r in engine.drain_reports() if r.order_id == order]
+    assert [r.exec_type for r in reports] == [ExecType.NEW, ExecType.PARTIAL_FILL, ExecType.CANCELLED]
+    assert reports[-1].leaves_qty == 0
+    assert engine.status(order) == OrderStatus.CANCELLED
+    assert engine.best_bid("AAPL") == pytest.approx(10.00)
+
+def test_out_of_range_symbol_ids_raise():
+    engine = cpp_oms.MatchingEngine()
+    engine.symbol_id("AAPL")
+    with pytest.raises(IndexError):
+        engine.symbol_name(1)
+    assert engine.best_bid("UNKNOWN") is None
+    assert engine.depth("UNKNOWN", BUY, 1.0) == 0
+
+def test_proxy_fills_against_seeded_liquidity():
+    proxy = OrderProxy()
+    order_id = proxy.send_order("AAPL", "BUY", 100, 150.0)
+    assert proxy.get_order_status(order_id) == "FILLED"
+
+    reports = proxy.execution_reports()
+    fills = [r for r in reports if r['exec_type'] == 'FILL']
+    assert {r['synthetic'] for r in fills} == {True, False}
+    assert all(r['symbol'] == 'AAPL' for r in reports)
+
+    strict = OrderProxy(simulate_liquidity=False)
+    assert strict.get_order_status(strict.send_order("AAPL", "BUY", 100, 150.0)) == "NEW"
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from src.common.panel import Panel
+from src.processing.features import generate_features, FEATURE_COLUMNS
+from src.strategy.ma_cross import MovingAverageCross
+from src.backtesting.engine import Backtester
+
+def _sorted(df):
+    return df.sort_values(['Date', 'Symbol']).reset_index(drop=True)
+
+def test_round_trip(ragged_bars):
+    panel = Panel.from_long(ragged_bars)
+    assert panel.mask.sum() == len(ragged_bars)
+    back = panel.to_long()
+    expected = _sorted(ragged_bars)
+    pd.testing.assert_frame_equal(back[expected.columns], expected, check_dtype=False)
+
+def test_features_match_long_path(ragged_bars):
+    long = _sorted(generate_features(ragged_bars.copy()))
+    wide = generate_features(Panel.from_long(ragged_bars)).to_long()
+    for col in FEATURE_COLUMNS + ['EMA_20']:
+        np.testing.assert_allclose(wide[col], long[col], rtol=1e-9, atol=1e-12, equal_nan=True, err_msg=col)
+
+def test_signals_and_backtest_match_long_path(ragged_bars):
+    features = generate_features(ragged_bars.copy())
+    strategy = MovingAverageCross(fast_window=5, slow_window=20)
+    long = _sorted(strategy.generate_signals(features))
+    wide = strategy.generate_signals(Panel.from_long(features))
+    np.testing.assert_allclose(wide.to_long()['Target_Position'], long['Target_Position'], equal_nan=True)
+
+    equity_long = Backtester().run(features, long)
+    equity_wide = Backtester().run(Panel.from_long(features), wide)
+    np.testing.assert_allclose(equity_wide['Equity'], equity_long['Equity'])
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from src.processing.features import generate_features
+from src.processing.parallel_features import merge_order
+
+def test_parallel_matches_serial(ragged_bars):
+    serial = generate_features(ragged_bars.copy())
+    parallel = generate_features(ragged_bars.copy(), n_jobs=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+def test_parallel_accepts_date_index(ragged_bars):
+    bars = ragged_bars.set_index('Date')
+    serial = generate_features(bars.copy())
+    parallel = generate_features(bars.copy(), n_jobs=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+def test_merge_order_keeps_run_order_on_ties():
+    # Three sorted runs sharing keys; equal keys must come out in run order
+    keys = np.array([0, 2, 2, 5,   1, 2, 5,   2, 3])
+    bounds = [(0, 4), (4, 7), (7, 9)]
+    order = merge_order(keys, bounds)
+    assert order.tolist() == [0, 4, 1, 2, 5, 7, 8, 3, 6]
+    assert (np.diff(keys[order]) >= 0).all()
+    assert merge_order(keys, []).size == 0
@@ -0,0 +1,59 @@
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.replay import ReplayHarness, STAGES
+from src.strategy.ma_cross import MovingAverageCross
+from src.risk.risk_manager import RiskManager
+from src.execution.order_proxy import OrderProxy
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2024-01-01", periods=40, tz="UTC")
+    frames = []
+    for k, drift in enumerate([0.01, -0.01, 0.005]):
+        close = 100 * np.exp(np.cumsum(drift + rng.normal(0, 0.005, len(dates))))
+        frames.append(pd.DataFrame({'Date': dates, 'Symbol': f"S{k}", 'Open': close, 'High': close,
+                                    'Low': close, 'Close': close, 'Volume': 1e6}))
+    return pd.concat(frames, ignore_index=True)
+
+def _harness():
+    return ReplayHarness(MovingAverageCross(fast_window=3, slow_window=8), RiskManager(max_pos_size=1.0),
+                         OrderProxy(), speed=None, lookback=25, queue_size=4)
+
+def test_fast_replay_counters_and_stages(bars):
+    harness = _harness()
+    result = harness.run(bars)
+
+    assert result['Events'] == result['Processed'] == 40
+    assert result['Dropped'] == result['Backpressure'] == result['Deadline Misses'] == 0
+    assert result['Orders Sent'] > 0
+    assert list(result['Latency']['Stage']) == STAGES
+    counts = result['Latency'].set_index('Stage')['Count']
+    assert counts['queue_wait'] == counts['service'] == counts['tick_to_order'] == 40
+    assert counts['order'] == result['Orders Sent']
+    assert counts['risk'] == result['Orders Sent'] + result['Risk Rejections']
+
+    # A second run starts from scratch rather than accumulating
+    again = harness.run(bars)
+    assert again['Processed'] == 40
+    assert again['Orders Sent'] == result['Orders Sent']
+    assert again['Latency'].set_index('Stage')['Count']['service'] == 40
+
+def test_nan_close_is_skipped(bars):
+    bars.loc[(bars['Symbol'] == 'S0') & (bars['Date'] == bars['Date'].iloc[-1]), 'Close'] = np.nan
+    result = _harness().run(bars)
+    assert result['Processed'] == 40
+    assert result['Invalid Prices'] == 1
+
+def test_consumer_error_stops_producer(bars, monkeypatch):
+    harness = _harness()
+    def fail(*args):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(harness, '_on_bar', fail)
+    threads = threading.active_count()
+    with pytest.raises(RuntimeError):
+        harness.run(bars)
+    assert threading.active_count() == threads